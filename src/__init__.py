@@ -8,10 +8,16 @@ import fastapi.staticfiles
 
 import src.config.celery
 import src.config.fastapi
+import src.const.header
 import src.db
+import src.db.write_behind
 import src.error_handler
+import src.password_hasher
 import src.redis
+import src.redis.token_revocation
 import src.route
+import src.util.fastapi.server_timing
+import src.util.struct.expiring_lru_cache
 
 
 def create_app(**kwargs: dict) -> fastapi.FastAPI:
@@ -22,10 +28,24 @@ def create_app(**kwargs: dict) -> fastapi.FastAPI:
         app.state.config_obj = config_obj
         app.state.async_db = src.db.AsyncDB(config_obj=config_obj)
         app.state.async_redis = src.redis.AsyncRedis(config_obj=config_obj)
+        app.state.write_behind = src.db.write_behind.WriteBehindBuffer(
+            config_obj=config_obj, async_db=app.state.async_db, async_redis=app.state.async_redis
+        )
+        app.state.token_revocation_cache = src.redis.token_revocation.TokenRevocationCache(
+            config_obj=config_obj, async_redis=app.state.async_redis
+        )
+        app.state.password_hasher = src.password_hasher.AsyncPasswordHasher(config_obj=config_obj)
+        app.state.access_token_cache = src.util.struct.expiring_lru_cache.ExpiringLRUCache(
+            maxsize=config_obj.security.access_token_cache_size
+        )
 
         async with contextlib.AsyncExitStack() as async_stack:
             await async_stack.enter_async_context(app.state.async_db)  # type: ignore[arg-type]
             await async_stack.enter_async_context(app.state.async_redis)  # type: ignore[arg-type]
+            # Entered after DB and Redis, so that buffered writes are flushed before those are closed.
+            await async_stack.enter_async_context(app.state.write_behind)  # type: ignore[arg-type]
+            await async_stack.enter_async_context(app.state.token_revocation_cache)  # type: ignore[arg-type]
+            await async_stack.enter_async_context(app.state.password_hasher)  # type: ignore[arg-type]
             yield
 
     if config_obj.sentry and config_obj.sentry.is_sentry_available(mode="api"):
@@ -70,7 +90,12 @@ def create_app(**kwargs: dict) -> fastapi.FastAPI:
                 allow_credentials=True,
                 allow_methods=["*"],
                 allow_headers=["*"],
+                expose_headers=[
+                    src.const.header.HeaderKey.ETAG.value.alias,
+                    src.const.header.HeaderKey.SERVER_TIMING.value.alias,
+                ],
             ),
+            fastapi.middleware.Middleware(src.util.fastapi.server_timing.QueryStatsMiddleware),
         ],
     )
     app.mount("/static", fastapi.staticfiles.StaticFiles(directory="src/static"), name="static")
@@ -0,0 +1,66 @@
+import asyncio
+import time
+import typing
+import uuid
+
+import sqlalchemy as sa
+import sqlalchemy.ext.asyncio as sa_ext_asyncio
+import typer
+
+import src.config.fastapi
+import src.db
+import src.db.model.user as user_model
+import src.db.pipeline
+
+config_obj = src.config.fastapi.get_fastapi_setting()
+
+
+async def run_sequentially(session: sa_ext_asyncio.AsyncSession, statements: list[sa.Executable]) -> None:
+    for statement in statements:
+        await session.execute(statement)
+    await session.commit()
+
+
+async def run_in_pipeline(session: sa_ext_asyncio.AsyncSession, statements: list[sa.Executable]) -> None:
+    await src.db.pipeline.execute_pipeline(session, statements, commit=True)
+
+
+async def measure(
+    db: src.db.AsyncDB,
+    func: typing.Callable[[sa_ext_asyncio.AsyncSession, list[sa.Executable]], typing.Awaitable[None]],
+    statements: list[sa.Executable],
+    number: int,
+) -> float:
+    """Returns milliseconds per group of statements, including the COMMIT."""
+    elapsed = 0.0
+    async with db.get_async_session() as session:
+        for _ in range(number):
+            started_at = time.perf_counter()
+            await func(session, statements)
+            elapsed += time.perf_counter() - started_at
+    return elapsed / number * 1000
+
+
+async def bench(statement_count: int, number: int) -> None:
+    # UPDATEs of users which don't exist, as only statements without RETURNING can be pipelined.
+    statements: list[sa.Executable] = [
+        sa.update(user_model.User).where(user_model.User.uuid == uuid.uuid4()).values(website=user_model.User.website)
+        for _ in range(statement_count)
+    ]
+    async with src.db.AsyncDB(config_obj=config_obj) as db:
+        # Warm up connections and prepared statements before measuring.
+        await measure(db, run_sequentially, statements, 10)
+        sequential = await measure(db, run_sequentially, statements, number)
+        pipelined = await measure(db, run_in_pipeline, statements, number)
+
+    typer.echo(f"{statement_count} statements + COMMIT, average of {number} runs")
+    typer.echo(f"{'sequential':<12} {sequential:>8.3f} ms")
+    typer.echo(f"{'pipeline':<12} {pipelined:>8.3f} ms  (x{sequential / pipelined:.1f})")
+
+
+def bench_pipeline(statement_count: int = 5, number: int = 200) -> None:
+    """독립적인 SQL 문 여러 개를 하나씩 보낼 때와 psycopg 파이프라인으로 보낼 때의 지연 시간을 비교합니다. (DB 연결 필요)"""
+    asyncio.run(bench(statement_count, number))
+
+
+cli_patterns: list[typing.Callable] = [bench_pipeline]
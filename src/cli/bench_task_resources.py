@@ -0,0 +1,67 @@
+import time
+import typing
+
+import sqlalchemy as sa
+import typer
+
+import redis
+import src.config.celery
+import src.db
+import src.redis
+
+config_obj = src.config.celery.get_celery_setting()
+
+
+def run_task(db: src.db.SyncDB, redis_pool: redis.ConnectionPool) -> None:
+    # Stands in for a task body which touches both DB and Redis once.
+    with db.get_sync_session() as session:
+        session.execute(sa.text("SELECT 1"))
+    with redis.Redis(connection_pool=redis_pool) as client:
+        client.ping()
+
+
+def run_with_per_task_resources(number: int) -> float:
+    """How SessionTask worked before: DB engine and Redis pool are created and closed around every task."""
+    started_at = time.perf_counter()
+    for _ in range(number):
+        db = src.db.SyncDB(config_obj=config_obj).open()
+        # Not SyncRedis.open, which flushes Redis on debug mode.
+        redis_pool = redis.ConnectionPool.from_url(**config_obj.redis.to_redis_config())
+        with redis.Redis(connection_pool=redis_pool) as client:
+            client.ping()
+
+        run_task(db, redis_pool)
+
+        db.close()
+        redis_pool.disconnect(inuse_connections=True)
+    return time.perf_counter() - started_at
+
+
+def run_with_worker_resources(number: int) -> float:
+    """How SessionTask works now: tasks borrow sessions from the resources opened once per worker process."""
+    db = src.db.SyncDB(config_obj=config_obj).open()
+    redis_pool = redis.ConnectionPool.from_url(**config_obj.redis.to_redis_config())
+    try:
+        started_at = time.perf_counter()
+        for _ in range(number):
+            run_task(db, redis_pool)
+        return time.perf_counter() - started_at
+    finally:
+        db.close()
+        redis_pool.disconnect(inuse_connections=True)
+
+
+def bench_task_resources(number: int = 200) -> None:
+    """
+    Celery 작업마다 DB/Redis 연결을 새로 만들 때와 워커 프로세스의 연결을 빌려 쓸 때의
+    작업 처리량을 비교합니다. (DB, Redis 연결 필요)
+    """
+    per_task = run_with_per_task_resources(number)
+    per_worker = run_with_worker_resources(number)
+
+    typer.echo(f"{number} tasks, each running SELECT 1 and PING")
+    typer.echo(f"{'per task':<12} {number / per_task:>10.1f} tasks/s")
+    typer.echo(f"{'per worker':<12} {number / per_worker:>10.1f} tasks/s  (x{per_task / per_worker:.1f})")
+
+
+cli_patterns: list[typing.Callable] = [bench_task_resources]
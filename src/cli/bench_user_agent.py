@@ -0,0 +1,80 @@
+import time
+import typing
+
+import typer
+import user_agents
+
+import src.util.string_util
+
+SAMPLE_USER_AGENTS: list[str] = [
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 "
+    "(KHTML, like Gecko) Version/17.4 Safari/605.1.15",
+    "Mozilla/5.0 (iPhone; CPU iPhone OS 17_4 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Mobile/15E148",
+    "Mozilla/5.0 (Linux; Android 14; SM-S918N) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/124.0.0.0 Mobile Safari/537.36",
+    "Mozilla/5.0 (iPad; CPU OS 17_4 like Mac OS X) AppleWebKit/605.1.15 "
+    "(KHTML, like Gecko) Version/17.4 Mobile Safari/604.1",
+]
+
+
+def compare_user_agent_uncached(user_agent_a_str: str, user_agent_b_str: str) -> bool:
+    # Same as src.util.string_util.compare_user_agent before the fingerprint cache was introduced.
+    user_agent_a = user_agents.parse(user_agent_a_str)
+    user_agent_b = user_agents.parse(user_agent_b_str)
+
+    return all(
+        (
+            user_agent_a.is_mobile == user_agent_b.is_mobile,
+            user_agent_a.is_tablet == user_agent_b.is_tablet,
+            user_agent_a.is_pc == user_agent_b.is_pc,
+            user_agent_a.os.family == user_agent_b.os.family,
+            user_agent_a.browser.family == user_agent_b.browser.family,
+        )
+    )
+
+
+def get_distinct_user_agents(number: int, tag: str) -> list[str]:
+    # Every string is seen only once, so that no cache, including the one of ua_parser, can answer it.
+    return [f"{SAMPLE_USER_AGENTS[i % len(SAMPLE_USER_AGENTS)]} Bench/{tag}.{i}" for i in range(number)]
+
+
+def measure(func: typing.Callable[[str], typing.Any], user_agent_strs: list[str]) -> float:
+    """Returns microseconds per call."""
+    started_at = time.perf_counter()
+    for user_agent_str in user_agent_strs:
+        func(user_agent_str)
+    return (time.perf_counter() - started_at) / len(user_agent_strs) * 1_000_000
+
+
+def bench_user_agent(number: int = 2000) -> None:
+    """토큰 검증 시 User-Agent 비교 비용을 캐시 적용 전후로 측정합니다."""
+    repeated_user_agents = [SAMPLE_USER_AGENTS[i % len(SAMPLE_USER_AGENTS)] for i in range(number)]
+    compare_user_agent = src.util.string_util.compare_user_agent
+    get_user_agent_fingerprint = src.util.string_util.get_user_agent_fingerprint
+
+    get_user_agent_fingerprint.cache_clear()
+    results: dict[str, float] = {
+        "uncached (cold parse)": measure(
+            lambda ua: compare_user_agent_uncached(ua, ua), get_distinct_user_agents(number, "uncached")
+        ),
+        "uncached (parse both)": measure(lambda ua: compare_user_agent_uncached(ua, ua), repeated_user_agents),
+        "cached (cold)": measure(lambda ua: compare_user_agent(ua, ua), get_distinct_user_agents(number, "cached")),
+    }
+
+    get_user_agent_fingerprint.cache_clear()
+    fingerprint_claims = {ua: get_user_agent_fingerprint(ua) for ua in SAMPLE_USER_AGENTS}
+    results |= {
+        "cached (compare_user_agent)": measure(lambda ua: compare_user_agent(ua, ua), repeated_user_agents),
+        "cached + fingerprint claim": measure(
+            lambda ua: get_user_agent_fingerprint(ua) == fingerprint_claims[ua], repeated_user_agents
+        ),
+    }
+
+    baseline = results["uncached (cold parse)"]
+    for name, elapsed in results.items():
+        typer.echo(f"{name:<30} {elapsed:>10.2f} us/op  (x{baseline / elapsed:.1f})")
+    typer.echo(f"fingerprint cache: {get_user_agent_fingerprint.cache_info()}")
+
+
+cli_patterns: list[typing.Callable] = [bench_user_agent]
@@ -0,0 +1,93 @@
+import itertools
+import time
+import typing
+import uuid
+
+import sqlalchemy as sa
+import typer
+
+import src.config.fastapi
+import src.db
+import src.util.uuid_util
+
+config_obj = src.config.fastapi.get_fastapi_setting()
+
+
+class Variant(typing.NamedTuple):
+    name: str
+    uuid_factory: typing.Callable[[], uuid.UUID]
+    duplicate_pk_index: bool
+
+
+VARIANTS: list[Variant] = [
+    Variant("uuid4 + duplicate index", uuid.uuid4, duplicate_pk_index=True),  # PrimaryKeyType before UUIDv7
+    Variant("uuid4", uuid.uuid4, duplicate_pk_index=False),
+    Variant("uuid7", src.util.uuid_util.uuid7, duplicate_pk_index=False),
+]
+
+
+def create_signin_history_table(metadata: sa.MetaData, variant_index: int, variant: Variant) -> sa.Table:
+    # Shaped like usersigninhistory, as a temporary table so that nothing is left behind.
+    table = sa.Table(
+        f"bench_uuid_pk_{variant_index}",
+        metadata,
+        sa.Column("uuid", sa.Uuid, primary_key=True),
+        sa.Column("user_uuid", sa.Uuid, nullable=False),
+        sa.Column("ip", sa.String, nullable=False),
+        sa.Column("user_agent", sa.String, nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        prefixes=["TEMPORARY"],
+    )
+    if variant.duplicate_pk_index:
+        sa.Index(f"ix_bench_uuid_pk_{variant_index}_uuid", table.c.uuid, unique=True)
+    return table
+
+
+def bench_uuid_pk(rows: int = 200000, batch_size: int = 1000, users: int = 1000) -> None:
+    """
+    usersigninhistory 형태의 임시 테이블에 uuid4/uuid7 기본키로 행을 넣어보며,
+    삽입 처리량과 인덱스 크기를 비교합니다. (DB 연결 필요, 임시 테이블만 사용)
+    """
+    user_uuids = [uuid.uuid4() for _ in range(users)]
+    user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0.0.0"
+
+    typer.echo(f"{'':<25} {'insert':>14} {'PK index':>10} {'all indexes':>12} {'table':>10}")
+    with src.db.SyncDB(config_obj=config_obj) as db, db.engine.connect() as connection:
+        for variant_index, variant in enumerate(VARIANTS):
+            table = create_signin_history_table(sa.MetaData(), variant_index, variant)
+            table.create(connection)
+
+            elapsed = 0.0
+            for batch in itertools.batched(range(rows), batch_size):
+                values = [
+                    {
+                        "uuid": variant.uuid_factory(),
+                        "user_uuid": user_uuids[i % users],
+                        "ip": "127.0.0.1",
+                        "user_agent": user_agent,
+                    }
+                    for i in batch
+                ]
+                started_at = time.perf_counter()
+                connection.execute(table.insert(), values)
+                connection.commit()
+                elapsed += time.perf_counter() - started_at
+
+            sizes = connection.execute(
+                sa.text(
+                    "SELECT pg_relation_size(CAST(:pk_index AS regclass)), "
+                    "pg_indexes_size(CAST(:table AS regclass)), pg_table_size(CAST(:table AS regclass))"
+                ),
+                {"pk_index": f"{table.name}_pkey", "table": table.name},
+            ).one()
+            pk_index_size, indexes_size, table_size = (size / 1024 / 1024 for size in sizes)
+            typer.echo(
+                f"{variant.name:<25} {rows / elapsed:>9.0f} row/s "
+                f"{pk_index_size:>7.1f} MB {indexes_size:>9.1f} MB {table_size:>7.1f} MB"
+            )
+
+            table.drop(connection)
+            connection.commit()
+
+
+cli_patterns: list[typing.Callable] = [bench_uuid_pk]
@@ -0,0 +1,67 @@
+import statistics
+import time
+import typing
+
+import argon2
+import typer
+
+import src.config.fastapi
+
+CALIBRATION_PASSWORD = "calibration-P@ssw0rd"  # nosec B105
+# See https://cheatsheetseries.owasp.org/cheatsheets/Password_Storage_Cheat_Sheet.html
+OWASP_MIN_MEMORY_COST = 19 * 1024  # KiB
+
+
+def measure_verify_ms(time_cost: int, memory_cost: int, parallelism: int, repeat: int) -> float:
+    hasher = argon2.PasswordHasher(time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism)
+    password_hash = hasher.hash(CALIBRATION_PASSWORD)
+
+    elapsed: list[float] = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        hasher.verify(password_hash, CALIBRATION_PASSWORD)
+        elapsed.append((time.perf_counter() - started_at) * 1000)
+    return statistics.median(elapsed)
+
+
+def calibrate_argon2(
+    target_ms: float = 250.0,
+    max_memory_cost: int = 256 * 1024,
+    min_memory_cost: int = OWASP_MIN_MEMORY_COST,
+    parallelism: int | None = None,
+    max_time_cost: int = 10,
+    repeat: int = 3,
+) -> None:
+    """현재 장비에서 목표 검증 시간(target_ms) 안에 끝나는 Argon2 파라미터를 측정하여 추천합니다."""
+    config_obj = src.config.fastapi.get_fastapi_setting().password_hasher
+    parallelism = parallelism or config_obj.parallelism
+    current_ms = measure_verify_ms(config_obj.time_cost, config_obj.memory_cost, config_obj.parallelism, repeat)
+    typer.echo(
+        f"current: time_cost={config_obj.time_cost} memory_cost={config_obj.memory_cost}KiB "
+        f"parallelism={config_obj.parallelism} -> {current_ms:.1f}ms"
+    )
+
+    # Memory cost is preferred over time cost, so try from the largest memory cost and stop at the first fit.
+    recommendation: tuple[int, int, float] | None = None
+    memory_cost = max_memory_cost
+    while memory_cost >= min_memory_cost and not recommendation:
+        for time_cost in range(1, max_time_cost + 1):
+            elapsed_ms = measure_verify_ms(time_cost, memory_cost, parallelism, repeat)
+            typer.echo(f"  time_cost={time_cost:<3} memory_cost={memory_cost:>7}KiB -> {elapsed_ms:8.1f}ms")
+            if elapsed_ms > target_ms:
+                break
+            recommendation = (time_cost, memory_cost, elapsed_ms)
+        memory_cost //= 2
+
+    if not recommendation:
+        typer.echo(f"No parameters found within {target_ms}ms, consider raising target_ms or lowering min_memory_cost.")
+        raise typer.Exit(code=1)
+
+    time_cost, memory_cost, elapsed_ms = recommendation
+    typer.echo(f"recommended ({elapsed_ms:.1f}ms per verification, per worker):")
+    typer.echo(f"PASSWORD_HASHER__TIME_COST={time_cost}")
+    typer.echo(f"PASSWORD_HASHER__MEMORY_COST={memory_cost}")
+    typer.echo(f"PASSWORD_HASHER__PARALLELISM={parallelism}")
+
+
+cli_patterns: list[typing.Callable] = [calibrate_argon2]
@@ -0,0 +1,49 @@
+import datetime
+import logging
+import typing
+
+import sqlalchemy as sa
+
+import src.config.fastapi
+import src.db
+
+logger = logging.getLogger(__name__)
+config_obj = src.config.fastapi.get_fastapi_setting()
+
+# Tables of the Celery database result backend, with their default names.
+RESULT_TABLE_NAMES = ["celery_taskmeta", "celery_tasksetmeta"]
+
+
+def cleanup_task_results(expires: int = 60 * 60 * 24, batch_size: int = 5000, drop_tables: bool = False) -> None:
+    """
+    Celery DB 결과 백엔드 테이블에서 expires초보다 오래된 작업 결과를 batch_size개씩 삭제합니다.
+    결과 저장소를 DB에서 Redis 등으로 옮긴 뒤 남은 테이블은 drop_tables로 삭제할 수 있습니다.
+    """
+    # date_done is stored by Celery as a naive UTC datetime.
+    cutoff = datetime.datetime.now(tz=datetime.UTC).replace(tzinfo=None) - datetime.timedelta(seconds=expires)
+
+    with src.db.SyncDB(config_obj=config_obj) as db, db.engine.connect() as connection:
+        metadata = sa.MetaData()
+        existing_table_names = set(sa.inspect(connection).get_table_names())
+        for table_name in RESULT_TABLE_NAMES:
+            if table_name not in existing_table_names:
+                continue
+
+            if drop_tables:
+                sa.Table(table_name, metadata, autoload_with=connection).drop(connection)
+                connection.commit()
+                logger.warning(f"{table_name} dropped.")
+                continue
+
+            # Deleted in small transactions, so that the sweep doesn't hold locks or bloat WAL for long.
+            table = sa.Table(table_name, metadata, autoload_with=connection)
+            expired_ids = sa.select(table.c.id).where(table.c.date_done < cutoff).limit(batch_size)
+            deleted = 0
+            while rowcount := connection.execute(sa.delete(table).where(table.c.id.in_(expired_ids))).rowcount:
+                connection.commit()
+                deleted += rowcount
+            connection.commit()
+            logger.warning(f"{deleted} expired results deleted from {table_name}.")
+
+
+cli_patterns: list[typing.Callable] = [cleanup_task_results]
@@ -9,6 +9,7 @@ import src.config.redis
 import src.config.sqlalchemy
 
 LOGLEVEL = typing.Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+RESULT_STORE = typing.Literal["redis", "db", "disabled"]
 
 
 class CelerySetting(pydantic_settings.BaseSettings):
@@ -18,9 +19,24 @@ class CelerySetting(pydantic_settings.BaseSettings):
     broker_url: str | None = None
 
     sqlalchemy: src.config.sqlalchemy.SQLAlchemySetting
+
+    # Where task results are stored, result_backend is assembled from this:
+    # - redis: on the broker Redis, where result keys expire by themselves after result_expires.
+    # - db: on the API database, swept by the celery.backend_cleanup task which celery beat runs daily.
+    # - disabled: nowhere, so AsyncResult.get() cannot be used.
+    result_store: RESULT_STORE = "redis"
     result_backend: str | None = None
-    result_extended: bool = True
-    result_expires: int | None = None
+    result_extended: bool = False  # Stores args, kwargs, worker and so on with the result when enabled.
+    result_expires: int | None = 60 * 60 * 24  # seconds, never expires if None
+    # msgpack is not installed by default, add it to the dependencies before setting it.
+    result_serializer: typing.Literal["json", "msgpack"] = "json"
+    result_compression: typing.Literal["zlib", "gzip", "bzip2"] | None = "zlib"
+    result_accept_content: list[str] | None = None
+
+    # Most tasks are fire-and-forget, so their results are not stored unless the task is declared with
+    # ignore_result=False, or overridden here by task name, e.g. {"some.task": {"ignore_result": False}}.
+    task_ignore_result: bool = True
+    task_annotations: dict[str, dict[str, typing.Any]] | None = None
 
     imports: list[str] = ["src.celery_task.task"]
 
@@ -39,8 +55,17 @@ class CelerySetting(pydantic_settings.BaseSettings):
     def assemble_urls(self) -> typing.Self:
         self.broker_url = self.redis.uri
 
-        # We need to replace the scheme of the URL from postgresql to db.
-        self.result_backend = "db+" + str(self.sqlalchemy.dsn)
+        match self.result_store:
+            case "redis":
+                self.result_backend = self.redis.uri
+            case "db":
+                # We need to replace the scheme of the URL from postgresql to db.
+                self.result_backend = "db+" + str(self.sqlalchemy.dsn)
+            case "disabled":
+                self.result_backend = None
+
+        # Results are read by the API too, which must accept the serializer of the results.
+        self.result_accept_content = list(dict.fromkeys(["json", self.result_serializer]))
         return self
 
 
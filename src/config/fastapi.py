@@ -14,8 +14,10 @@ import pydantic_settings
 import toml
 
 import src.config.monitor
+import src.config.password_hasher
 import src.config.redis
 import src.config.sqlalchemy
+import src.config.write_behind
 
 AUTHOR_REGEX = re.compile(r"^(?P<name>[\w\s\d\-]+)\s<(?P<email>.+@.+)>$")
 
@@ -75,6 +77,15 @@ class SecuritySetting(pydantic_settings.BaseSettings):
     https_enabled: bool = True
     jwt_algorithm: typing.Literal["HS256"] = "HS256"
 
+    # Number of verified access tokens to keep in memory per worker, 0 disables the cache.
+    access_token_cache_size: int = 10000
+    # Store parsed User-Agent fingerprint on tokens, so that only the request's User-Agent is parsed on validation.
+    user_agent_fingerprint_claim: bool = True
+    # Keep revoked tokens in memory per worker, synced by Redis pub/sub, instead of asking Redis on every request.
+    token_revocation_local_cache: bool = True
+    # Seconds without hearing from Redis after which the local revocation set is not trusted, and Redis is asked.
+    token_revocation_max_staleness: float = 5.0
+
 
 class FastAPISetting(pydantic_settings.BaseSettings):
     host: str
@@ -90,6 +101,10 @@ class FastAPISetting(pydantic_settings.BaseSettings):
 
     sqlalchemy: src.config.sqlalchemy.SQLAlchemySetting
     redis: src.config.redis.RedisSetting
+    password_hasher: src.config.password_hasher.PasswordHasherSetting = (
+        src.config.password_hasher.PasswordHasherSetting()
+    )
+    write_behind: src.config.write_behind.WriteBehindSetting = src.config.write_behind.WriteBehindSetting()
     project_info: ProjectInfoSetting = ProjectInfoSetting.from_pyproject()
     openapi: OpenAPISetting = OpenAPISetting()
     security: SecuritySetting = SecuritySetting()
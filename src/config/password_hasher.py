@@ -0,0 +1,32 @@
+import typing
+
+import argon2
+import pydantic_settings
+
+
+class PasswordHasherSetting(pydantic_settings.BaseSettings):
+    # Number of worker processes which hashes and verifies passwords on each API worker process.
+    # None means os.cpu_count() divided by WEB_CONCURRENCY(number of gunicorn workers, 1 if unset), at least 1,
+    # as every API worker has its own pool, and each job takes memory_cost of RAM.
+    max_workers: int | None = None
+    # Number of hash/verify jobs allowed to wait for a worker, new jobs are rejected with 503 when exceeded.
+    max_pending: int = 64
+
+    # Argon2id cost parameters, use `make cli-calibrate-argon2` to find out the values for the target machine.
+    # Changing these values won't break existing hashes, those will be rehashed on the next signin.
+    time_cost: int = argon2.DEFAULT_TIME_COST
+    memory_cost: int = argon2.DEFAULT_MEMORY_COST  # KiB
+    parallelism: int = argon2.DEFAULT_PARALLELISM
+    hash_len: int = argon2.DEFAULT_HASH_LENGTH
+    salt_len: int = argon2.DEFAULT_RANDOM_SALT_LENGTH
+
+    def to_argon2_config(self) -> dict[str, typing.Any]:
+        # See argon2.PasswordHasher.__init__ keyword arguments for more details
+        ARGON2_CONFIG_FIELDS = [
+            "time_cost",
+            "memory_cost",
+            "parallelism",
+            "hash_len",
+            "salt_len",
+        ]
+        return self.model_dump(include=ARGON2_CONFIG_FIELDS)
@@ -13,6 +13,12 @@ class RedisSetting(pydantic_settings.BaseSettings):
     dsn: pydantic.RedisDsn | None = None
     uri: str | None = None
 
+    # Connection pool related configs
+    max_connections: int | None = None
+    socket_timeout: float | None = 5.0
+    socket_connect_timeout: float | None = 5.0
+    health_check_interval: int = 30
+
     model_config = pydantic_settings.SettingsConfigDict(validate_default=True)
 
     @pydantic.model_validator(mode="after")
@@ -30,3 +36,13 @@ class RedisSetting(pydantic_settings.BaseSettings):
         )
         self.uri = str(self.dsn)
         return self
+
+    def to_redis_config(self) -> dict[str, typing.Any]:
+        # See redis.ConnectionPool.from_url keyword arguments for more details
+        REDIS_CONFIG_FIELDS = [
+            "max_connections",
+            "socket_timeout",
+            "socket_connect_timeout",
+            "health_check_interval",
+        ]
+        return self.model_dump(include=REDIS_CONFIG_FIELDS) | {"url": self.uri}
@@ -4,6 +4,7 @@ import typing
 
 import pydantic
 import pydantic_settings
+import sqlalchemy as sa
 
 
 class DBConnectionSetting(pydantic_settings.BaseSettings):
@@ -15,16 +16,48 @@ class DBConnectionSetting(pydantic_settings.BaseSettings):
     name: str
 
 
+class DBReplicaSetting(pydantic_settings.BaseSettings):
+    url: str
+    weight: int = pydantic.Field(default=1, ge=1)
+
+
 class SQLAlchemySetting(pydantic_settings.BaseSettings):
     echo: bool = False
     echo_pool: bool = False
+    # Costs a `SELECT 1` round trip per checkout.
+    # Can be turned off when pool_recycle is shorter than the idle timeout of the server and any proxy on the way.
     pool_pre_ping: bool = True
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0  # seconds to wait for a connection before giving up
+    pool_recycle: int = -1  # seconds, -1 to never recycle
+    pool_warmup: int = 0  # connections opened on startup, capped by pool_size
+    # Use when connecting through PgBouncer in transaction pooling mode:
+    # connections are not pooled on our side, and prepared statements are disabled.
+    pgbouncer: bool = False
+    statement_timeout: int | None = None  # milliseconds, applied by the server on every statement
+    # psycopg prepares a statement on the server once it has run this many times on a connection,
+    # so that later runs skip parsing and planning. 0 prepares at once, None never prepares.
+    prepare_threshold: int | None = 5
+    prepared_max: int = 100  # prepared statements kept per connection, least recently used ones are deallocated
+    # Statements slower than this are logged with their parameters redacted, None to disable.
+    slow_query_threshold: float | None = 500.0  # milliseconds
+    # A statement repeated this many times in a request is logged as a likely N+1 query, None to disable.
+    n_plus_one_threshold: int | None = 10
+    # Hides soft-deleted rows from every ORM SELECT of the sessions, see src.db.soft_delete.SoftDeleteSession.
+    soft_delete_filter: bool = False
     warn_20: bool = True
     dsn: pydantic.PostgresDsn | None = None
     url: str | None = None
 
     connection: DBConnectionSetting
 
+    # Read-only handlers are routed to these, see src.dependency.common.dbReadOnlyDI
+    replicas: list[DBReplicaSetting] = []
+    replica_health_check_interval: float = 5.0  # seconds
+    # Reads of a client go to the primary for this long after it writes, so that it can read its own writes.
+    read_your_writes_window: float = 5.0  # seconds
+
     model_config = pydantic_settings.SettingsConfigDict(validate_default=True)
 
     @pydantic.model_validator(mode="after")
@@ -43,11 +76,42 @@ class SQLAlchemySetting(pydantic_settings.BaseSettings):
         self.url = str(self.dsn)
         return self
 
-    def to_sqlalchemy_config(self) -> dict[str, typing.Any]:
+    def get_connect_args(self, driver: str) -> dict[str, typing.Any]:
+        connect_args: dict[str, typing.Any] = {}
+        if driver == "psycopg":
+            if self.statement_timeout is not None:
+                # PgBouncer must have `options` in its ignore_startup_parameters, or set this on the DB role instead.
+                connect_args["options"] = f"-c statement_timeout={self.statement_timeout}"
+            # Prepared statements live on a server connection, which PgBouncer may swap between transactions.
+            connect_args["prepare_threshold"] = None if self.pgbouncer else self.prepare_threshold
+        elif driver == "asyncpg":
+            if self.statement_timeout is not None:
+                connect_args["server_settings"] = {"statement_timeout": str(self.statement_timeout)}
+            # asyncpg prepares every statement, so only the cache size can be controlled.
+            statement_cache_size = 0 if self.pgbouncer or self.prepare_threshold is None else self.prepared_max
+            connect_args["statement_cache_size"] = statement_cache_size
+            connect_args["prepared_statement_cache_size"] = statement_cache_size
+        return connect_args
+
+    def to_sqlalchemy_config(self, url: str | None = None) -> dict[str, typing.Any]:
         SQLALCHEMY_CONFIG_FIELDS = [
             "echo",
             "echo_pool",
             "pool_pre_ping",
             "url",
         ]
-        return self.model_dump(include=SQLALCHEMY_CONFIG_FIELDS)
+        POOL_CONFIG_FIELDS = [
+            "pool_size",
+            "max_overflow",
+            "pool_timeout",
+            "pool_recycle",
+        ]
+        config = self.model_dump(include=SQLALCHEMY_CONFIG_FIELDS) | ({"url": url} if url else {})
+        if self.pgbouncer:
+            config["poolclass"] = sa.pool.NullPool
+        else:
+            config |= self.model_dump(include=POOL_CONFIG_FIELDS)
+
+        if connect_args := self.get_connect_args(sa.make_url(config["url"]).get_driver_name()):
+            config["connect_args"] = connect_args
+        return config
@@ -0,0 +1,13 @@
+import typing
+
+import pydantic_settings
+
+
+class WriteBehindSetting(pydantic_settings.BaseSettings):
+    # Durability of buffered timestamp updates(e.g. User.last_signin_at), from the strongest to the weakest:
+    # - sync: written in the transaction of the request, as nothing is buffered. For development and debugging.
+    # - redis: buffered on Redis, survives restarts and crashes of API workers. Use this on production.
+    # - memory: buffered on each API worker, lost when the worker crashes without shutting down gracefully.
+    mode: typing.Literal["sync", "redis", "memory"] = "redis"
+    flush_interval: float = 5.0  # seconds
+    max_batch_size: int = 1000
@@ -17,6 +17,8 @@ class CookieKey(enum.Enum):
 
     CSRF_TOKEN = CookieKeyData(path="/", expires=src.const.time.NEVER_EXPIRE_COOKIE_DATETIME)
     REFRESH_TOKEN = CookieKeyData(path="/authn/")
+    # Unix timestamp of the last DB write of the client, see src.db.replica.ReadAfterWrite
+    DB_WRITTEN_AT = CookieKeyData(path="/")
 
     def get_name(self) -> str:
         return (self.name if self.value.alias is None else self.value.alias).lower()
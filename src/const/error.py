@@ -105,9 +105,13 @@ class ErrorEnum(ErrorEnumMixin, enum.StrEnum):
 
 class ServerError(ErrorEnum):
     __default_args__ = {"status_code": fastapi.status.HTTP_500_INTERNAL_SERVER_ERROR, "should_log": True}
+    __additional_args__ = {
+        "SERVER_BUSY": ErrorStructDict(status_code=fastapi.status.HTTP_503_SERVICE_UNAVAILABLE),
+    }
 
     UNKNOWN_SERVER_ERROR = "알 수 없는 문제가 발생했습니다, 5분 후에 다시 시도해주세요."
     CRITICAL_SERVER_ERROR = "서버에 치명적인 문제가 발생했습니다, 관리자에게 문의해주시면 감사하겠습니다."
+    SERVER_BUSY = "요청이 많아 처리가 지연되고 있어요, 잠시 후 다시 시도해주세요."
 
 
 class DBServerError(ErrorEnum):
@@ -138,6 +142,10 @@ class AuthNError(ErrorEnum):
         "INVALID_REFRESH_TOKEN": ErrorStructDict(loc=["cookie", "refresh_token"]),
         "SIGNIN_FAILED": ErrorStructDict(loc=["body", "username"]),
         "SIGNIN_USER_NOT_FOUND": ErrorStructDict(loc=["body", "username"]),
+        "PASSWORD_CHANGE_WRONG_PASSWORD": ErrorStructDict(
+            status_code=fastapi.status.HTTP_422_UNPROCESSABLE_ENTITY,
+            loc=["body", "original_password"],
+        ),
     }
 
     INVALID_ACCESS_TOKEN = "유효하지 않은 인증 정보에요, 인증 정보를 갱신해주세요."  # nosec: B105
@@ -185,10 +193,18 @@ class ClientError(ErrorEnum):
         "RESOURCE_NOT_FOUND": ErrorStructDict(status_code=fastapi.status.HTTP_404_NOT_FOUND),
         "REQUEST_TOO_FREQUENT": ErrorStructDict(status_code=fastapi.status.HTTP_429_TOO_MANY_REQUESTS),
         "REQUEST_BODY_EMPTY": ErrorStructDict(status_code=fastapi.status.HTTP_400_BAD_REQUEST),
+        "INVALID_PAGINATION_CURSOR": ErrorStructDict(loc=["query", "cursor"]),
+        "RESOURCE_MODIFIED": ErrorStructDict(
+            status_code=fastapi.status.HTTP_412_PRECONDITION_FAILED,
+            loc=["header", "if-match"],
+        ),
+        "RESOURCE_CONFLICT": ErrorStructDict(status_code=fastapi.status.HTTP_409_CONFLICT),
     }
 
     API_NOT_FOUND = "요청하신 경로를 찾을 수 없어요, 새로고침 후 다시 시도해주세요."
     RESOURCE_NOT_FOUND = "요청하신 정보를 찾을 수 없어요."
+    RESOURCE_MODIFIED = "다른 곳에서 먼저 수정된 정보에요, 새로고침 후 다시 시도해주세요."
+    RESOURCE_CONFLICT = "다른 곳에서 동시에 수정되고 있는 정보에요, 잠시 후 다시 시도해주세요."
 
     REQUEST_TOO_FREQUENT = "요청이 너무 빈번해요, 조금 천천히 진행해주세요."
     REQUEST_BODY_EMPTY = "입력하신 정보가 서버에 전달되지 않았어요, 새로고침 후 다시 시도해주세요."
@@ -196,6 +212,7 @@ class ClientError(ErrorEnum):
     REQUEST_BODY_INVALID = "입력하신 정보가 올바르지 않아요, 다시 입력해주세요."
     REQUEST_BODY_CONTAINS_INVALID_CHAR = "입력 불가능한 문자가 포함되어 있어요, 다시 입력해주세요."
     INVALID_EMAIL = "이메일 형식이 올바르지 않아요, 이메일을 다시 입력해주세요."
+    INVALID_PAGINATION_CURSOR = "목록의 위치 정보가 올바르지 않아요, 새로고침 후 다시 시도해주세요."
 
     USERNAME_REQUIRED = "아이디를 입력해주세요!"
     USERNAME_TOO_SHORT = "아이디가 너무 짧아요! ({min_len}자~{max_len}자 이내로 설정해주세요)"
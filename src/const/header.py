@@ -12,6 +12,10 @@ class HeaderKey(enum.Enum):
         default: str | None = None
 
     ACCESS_TOKEN = HeaderKeyData(alias="Authorization")
+    ACCEPT = HeaderKeyData(alias="Accept")
+    ETAG = HeaderKeyData(alias="ETag")
+    IF_MATCH = HeaderKeyData(alias="If-Match")
+    SERVER_TIMING = HeaderKeyData(alias="Server-Timing")
     USER_AGENT = HeaderKeyData(alias="User-Agent")
     REAL_IP = HeaderKeyData(alias="X-Real-IP")
     FORWARDED_FOR = HeaderKeyData(alias="X-Fowarded-For")
@@ -7,6 +7,11 @@ class RedisKeyType(enum.StrEnum):
     EMAIL_VERIFICATION = enum.auto()
     EMAIL_PASSWORD_RESET = enum.auto()
     TOKEN_REVOKED = enum.auto()
+    TOKEN_REVOKED_INDEX = enum.auto()
+    TOKEN_REVOKED_BEFORE = enum.auto()
+    TOKEN_REVOKED_BEFORE_INDEX = enum.auto()
+    SIGNIN_FAILURE_COUNT = enum.auto()
+    WRITE_BEHIND = enum.auto()
 
     def as_redis_key(self, value: str) -> str:
         return f"{self.value}:{value}"
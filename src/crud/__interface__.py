@@ -1,20 +1,28 @@
 import functools
+import itertools
 import typing
 import uuid
 
 import pydantic
 import sqlalchemy as sa
+import sqlalchemy.dialects.postgresql as sa_pg
 import sqlalchemy.ext.asyncio as sa_ext_asyncio
 
 import src.const.error
+import src.db
+import src.db.replica
+import src.db.soft_delete
+import src.db.pipeline
 import src.db.__mixin__ as db_mixin
 import src.db.__type__ as db_types
+import src.util.fastapi.pagination
 import src.util.sqlalchemy
 
 T = typing.TypeVar("T")
 M = typing.TypeVar("M", bound=db_mixin.DefaultModelMixin)
 CreateSchema = typing.TypeVar("CreateSchema", bound=pydantic.BaseModel)
 UpdateSchema = typing.TypeVar("UpdateSchema", bound=pydantic.BaseModel)
+StatementBatch: typing.TypeAlias = tuple[sa.Executable, dict[str, typing.Any] | list[dict[str, typing.Any]]]
 
 
 async def commit_and_return(session: sa_ext_asyncio.AsyncSession, db_obj: T) -> T:
@@ -22,6 +30,53 @@ async def commit_and_return(session: sa_ext_asyncio.AsyncSession, db_obj: T) ->
     return db_obj
 
 
+async def execute_and_commit(
+    session: sa_ext_asyncio.AsyncSession, model: type[M], stmt: sa.Executable
+) -> M | None:
+    db_obj = await session.scalar(stmt)
+    await session.commit()
+    return db_obj
+
+
+async def execute_batches(
+    session: sa_ext_asyncio.AsyncSession, model: type[M], batches: list[StatementBatch], commit: bool
+) -> list[M]:
+    result: list[M] = []
+    for stmt, params in batches:
+        result.extend((await session.scalars(stmt, params)).all())
+    if commit:
+        await session.commit()
+    return result
+
+
+def build_keyset_page(rows: typing.Sequence[M], limit: int) -> src.util.fastapi.pagination.KeysetPage[M]:
+    # One more row than the limit is fetched to know whether the next page exists.
+    if len(rows) <= limit:
+        return src.util.fastapi.pagination.KeysetPage(items=list(rows))
+
+    items = list(rows[:limit])
+    next_cursor = src.util.fastapi.pagination.Cursor(created_at=items[-1].created_at, uuid=items[-1].uuid)
+    return src.util.fastapi.pagination.KeysetPage(items=items, next_cursor=next_cursor.encode())
+
+
+async def fetch_keyset_page(
+    session: sa_ext_asyncio.AsyncSession, model: type[M], query: sa.Select, limit: int
+) -> src.util.fastapi.pagination.KeysetPage[M]:
+    return build_keyset_page((await session.scalars(query)).all(), limit)
+
+
+async def stream_scalars(
+    session: sa_ext_asyncio.AsyncSession, model: type[M], query: sa.Select, yield_per: int
+) -> typing.AsyncGenerator[M, None]:
+    result = await session.stream_scalars(query, execution_options={"yield_per": yield_per})
+    try:
+        async for row in result:
+            yield row
+    finally:
+        # Releases the server-side cursor even when the consumer stops early.
+        await result.close()
+
+
 class CRUDBase(typing.Generic[M, CreateSchema, UpdateSchema]):
     """
     CRUD object with default methods to Create, Read, Update, Delete (CRUD).
@@ -44,6 +99,10 @@ class CRUDBase(typing.Generic[M, CreateSchema, UpdateSchema]):
     def columns_without_uuid(self) -> set[str]:
         return self.columns - {"uuid"}
 
+    @functools.cached_property
+    def not_nullable_columns(self) -> frozenset[str]:
+        return frozenset(c.name for c in src.util.sqlalchemy.get_not_nullable_columns(self.model))
+
     @typing.overload
     def get_using_query(self, session: db_types.Ss, query: sa.Select) -> M | None: ...
 
@@ -63,7 +122,9 @@ class CRUDBase(typing.Generic[M, CreateSchema, UpdateSchema]):
         ...
 
     def get(self, session: db_types.Ps, uuid: uuid.UUID) -> (M | None) | typing.Awaitable[M | None]:
-        return session.scalar(sa.select(self.model).where(self.model.uuid == uuid))
+        # lambda_stmt caches the statement by the lambda's code and `model`, so only `uuid` is bound per call.
+        model = self.model
+        return session.scalar(sa.lambda_stmt(lambda: sa.select(model).where(model.uuid == uuid)))
 
     @typing.overload
     def get_multi_using_query(
@@ -84,6 +145,82 @@ class CRUDBase(typing.Generic[M, CreateSchema, UpdateSchema]):
             query = query.limit(limit)
         return session.scalars(query)
 
+    def get_keyset_query(self, query: sa.Select, *, cursor: str | None = None, limit: int | None = None) -> sa.Select:
+        """Applies `(created_at, uuid)` descending order, and continues after the given cursor if any."""
+        query = query.order_by(self.model.created_at.desc(), self.model.uuid.desc())
+        if limit:
+            query = query.limit(limit)
+        if cursor:
+            last = src.util.fastapi.pagination.Cursor.decode(cursor)
+            query = query.where(
+                sa.tuple_(self.model.created_at, self.model.uuid)
+                < sa.tuple_(
+                    sa.literal(last.created_at, self.model.created_at.type),
+                    sa.literal(last.uuid, self.model.uuid.type),
+                )
+            )
+        return query
+
+    @typing.overload
+    def get_page_using_query(
+        self, session: db_types.Ss, query: sa.Select, *, cursor: str | None = None, limit: int
+    ) -> src.util.fastapi.pagination.KeysetPage[M]: ...
+
+    @typing.overload
+    def get_page_using_query(  # type: ignore[misc]
+        self, session: db_types.As, query: sa.Select, *, cursor: str | None = None, limit: int
+    ) -> typing.Awaitable[src.util.fastapi.pagination.KeysetPage[M]]: ...
+
+    def get_page_using_query(
+        self, session: db_types.Ps, query: sa.Select, *, cursor: str | None = None, limit: int
+    ) -> src.util.fastapi.pagination.KeysetPage[M] | typing.Awaitable[src.util.fastapi.pagination.KeysetPage[M]]:
+        """
+        Keyset pagination ordered by `(created_at, uuid)` descending.
+        Unlike offset, the cost of a page does not grow with its depth
+        when the filtered columns are followed by `(created_at, uuid)` in a composite index.
+        """
+        query = self.get_keyset_query(query, cursor=cursor, limit=limit + 1)
+        if session._is_asyncio:
+            return fetch_keyset_page(session, self.model, query, limit)
+        return build_keyset_page(session.scalars(query).all(), limit)
+
+    @typing.overload
+    def stream_using_query(
+        self, session: db_types.Ss, query: sa.Select, *, yield_per: int = 100
+    ) -> typing.Iterator[M]: ...
+
+    @typing.overload
+    def stream_using_query(  # type: ignore[misc]
+        self, session: db_types.As, query: sa.Select, *, yield_per: int = 100
+    ) -> typing.AsyncIterator[M]: ...
+
+    def stream_using_query(
+        self, session: db_types.Ps, query: sa.Select, *, yield_per: int = 100
+    ) -> typing.Iterator[M] | typing.AsyncIterator[M]:
+        """
+        Fetches rows through a server-side cursor, `yield_per` rows at a time.
+        Unlike get_multi_using_query, only one batch of ORM objects is held in memory at once.
+        """
+        if session._is_asyncio:
+            return stream_scalars(session, self.model, query, yield_per)
+        return iter(session.scalars(query.execution_options(yield_per=yield_per)))
+
+    async def stream_using_db(
+        self,
+        db: src.db.AsyncDB,
+        query: sa.Select,
+        *,
+        yield_per: int = 100,
+        read_after_write: src.db.replica.ReadAfterWrite | None = None,
+    ) -> typing.AsyncGenerator[M, None]:
+        """
+        stream_using_query on a read session that lives as long as the iteration does.
+        Streaming responses are sent after the request-scoped session dependency is closed, so they must use this.
+        """
+        async with db.get_async_read_session(read_after_write) as session:
+            async for row in self.stream_using_query(session, query, yield_per=yield_per):
+                yield row
+
     @typing.overload
     def create(self, session: db_types.Ss, obj_in: CreateSchema) -> M: ...
 
@@ -92,11 +229,8 @@ class CRUDBase(typing.Generic[M, CreateSchema, UpdateSchema]):
         ...
 
     def create(self, session: db_types.Ps, obj_in: CreateSchema) -> M | typing.Awaitable[M]:
-        db_obj: M = self.model(**obj_in.model_dump())
-
-        nulled_columns: set[str] = {k for k, v in src.util.sqlalchemy.orm2dict(db_obj).items() if v is None}
-        not_nullable_columns: set[str] = {c.name for c in src.util.sqlalchemy.get_not_nullable_columns(self.model)}
-        if nn_failed_columns := not_nullable_columns & nulled_columns:
+        data = obj_in.model_dump()
+        if nn_failed_columns := {c for c in self.not_nullable_columns if data.get(c) is None}:
             src.const.error.ErrorStruct.raise_multiple(
                 [
                     src.const.error.DBValueError.DB_NOT_NULL_CONSTRAINT_ERROR(
@@ -106,6 +240,8 @@ class CRUDBase(typing.Generic[M, CreateSchema, UpdateSchema]):
                     for column_name in nn_failed_columns
                 ]
             )
+
+        db_obj: M = self.model(**data)
         session.add(db_obj)
 
         if session._is_asyncio:
@@ -113,37 +249,268 @@ class CRUDBase(typing.Generic[M, CreateSchema, UpdateSchema]):
         session.commit()
         return db_obj
 
-    def get_or_create(self, session: db_types.Ss, obj_in: CreateSchema) -> tuple[M, bool]:
-        primary_fields: set[str]
-        if not (primary_fields := getattr(obj_in, "__primary_fields__", None)):
-            raise ValueError("obj_in must have __primary_fields__ attribute to use get_or_create")
+    def get_insert_values(self, obj_in: CreateSchema) -> dict[str, typing.Any]:
+        """
+        Values for an INSERT with Python-side column defaults (e.g. uuid, commit_id) filled in,
+        so that the row is known without RETURNING, e.g. for src.db.pipeline.execute_pipeline.
+        """
+        values = obj_in.model_dump()
+        for column in self.model.__table__.columns:
+            if column.key in values or column.default is None:
+                continue
+            if column.default.is_callable:
+                values[column.key] = column.default.arg(None)  # Wrapped to take the execution context
+            elif column.default.is_scalar:
+                values[column.key] = column.default.arg
+        self.check_not_nullable_many([values])
+        return values
+
+    def check_not_nullable_many(self, rows: typing.Sequence[dict[str, typing.Any]], *, partial: bool = False) -> None:
+        """Runs the NOT NULL check of `create` once for a whole batch. On `partial`, absent columns are not checked."""
+        if errors := [
+            src.const.error.DBValueError.DB_NOT_NULL_CONSTRAINT_ERROR(loc=["body", index, column_name])
+            for index, row in enumerate(rows)
+            for column_name in self.not_nullable_columns
+            if (column_name in row or not partial) and row.get(column_name) is None
+        ]:
+            src.const.error.ErrorStruct.raise_multiple(errors)
+
+    def execute_batches(
+        self, session: db_types.Ps, batches: list[StatementBatch], commit: bool
+    ) -> list[M] | typing.Awaitable[list[M]]:
+        if session._is_asyncio:
+            return execute_batches(session, self.model, batches, commit)
+
+        result: list[M] = [obj for stmt, params in batches for obj in session.scalars(stmt, params).all()]
+        if commit:
+            session.commit()
+        return result
+
+    def get_uuids_batches(
+        self, stmt: sa.Update | sa.Delete, uuids: typing.Iterable[uuid.UUID], chunk_size: int
+    ) -> list[StatementBatch]:
+        # `uuid = ANY(:uuids)` keeps a single bind parameter, so every chunk shares one cached statement.
+        uuids_param = sa.bindparam("uuids", type_=sa_pg.ARRAY(self.model.uuid.type))
+        stmt = stmt.where(self.model.uuid == sa.any_(uuids_param)).returning(self.model)
+        return [(stmt, {"uuids": list(chunk)}) for chunk in itertools.batched(uuids, chunk_size)]
+
+    def get_uuids_stmts(
+        self, stmt: sa.Update | sa.Delete, uuids: typing.Iterable[uuid.UUID], chunk_size: int
+    ) -> list[sa.Update | sa.Delete]:
+        # Same as get_uuids_batches without RETURNING, but chunks are bound to the statements to be pipelined.
+        uuids_type = sa_pg.ARRAY(self.model.uuid.type)
+        return [
+            stmt.where(self.model.uuid == sa.any_(sa.bindparam("uuids", list(chunk), type_=uuids_type)))
+            for chunk in itertools.batched(uuids, chunk_size)
+        ]
+
+    def execute_in_pipeline(
+        self, session: db_types.Ps, stmts: typing.Sequence[sa.Executable]
+    ) -> None | typing.Awaitable[None]:
+        """Sends statements without RETURNING in a single round trip on async sessions, see src.db.pipeline."""
+        if session._is_asyncio:
+            return src.db.pipeline.execute_pipeline(session, stmts)
 
-        stmt_filter = sa.and_(*[getattr(self.model, field) == getattr(obj_in, field) for field in primary_fields])
-        if db_obj := self.get_using_query(session, sa.select(self.model).where(stmt_filter)):
-            return db_obj, False
-        return self.create(session, obj_in=obj_in), True
+        for stmt in stmts:
+            session.execute(stmt)
+        return None
 
-    async def get_or_create_async(self, session: db_types.As, obj_in: CreateSchema) -> tuple[M, bool]:
+    @typing.overload
+    def create_many(
+        self, session: db_types.Ss, objs_in: typing.Iterable[CreateSchema], *, chunk_size: int = 500
+    ) -> list[M]: ...
+
+    @typing.overload
+    def create_many(  # type: ignore[misc]
+        self, session: db_types.As, objs_in: typing.Iterable[CreateSchema], *, chunk_size: int = 500
+    ) -> typing.Awaitable[list[M]]: ...
+
+    def create_many(
+        self, session: db_types.Ps, objs_in: typing.Iterable[CreateSchema], *, chunk_size: int = 500
+    ) -> list[M] | typing.Awaitable[list[M]]:
+        """Inserts rows with one `INSERT ... RETURNING` per chunk, and commits once after all chunks."""
+        rows = [obj_in.model_dump() for obj_in in objs_in]
+        self.check_not_nullable_many(rows)
+
+        stmt = sa.insert(self.model).returning(self.model, sort_by_parameter_order=True)
+        return self.execute_batches(
+            session, [(stmt, list(chunk)) for chunk in itertools.batched(rows, chunk_size)], commit=True
+        )
+
+    @functools.cached_property
+    def unique_column_sets(self) -> frozenset[frozenset[str]]:
+        """Column sets which `ON CONFLICT` can target, i.e. the primary key and unique constraints."""
+        primary_key = frozenset(c.name for c in self.model.__table__.primary_key.columns)
+        unique_constraints = src.util.sqlalchemy.get_unique_constraints(self.model).values()
+        return frozenset({primary_key, *(frozenset(c.name for c in columns) for columns in unique_constraints)})
+
+    def get_conflict_target(self, obj_in: CreateSchema) -> list[str]:
         primary_fields: set[str]
         if not (primary_fields := getattr(obj_in, "__primary_fields__", None)):
             raise ValueError("obj_in must have __primary_fields__ attribute to use get_or_create")
+        if frozenset(primary_fields) not in self.unique_column_sets:
+            raise ValueError(f"__primary_fields__ of {type(obj_in).__name__} must match a unique constraint")
+        return sorted(primary_fields)
+
+    def get_upsert_query(self, conflict_target: list[str]) -> sa_pg.Insert:
+        """
+        `INSERT ... ON CONFLICT (conflict_target) DO UPDATE ... RETURNING *, xmax = 0`,
+        which returns the row whether it is inserted or already exists, and whether it was inserted.
+        The no-op update locks the existing row, so that it is returned even when a concurrent transaction
+        has just inserted it, where `DO NOTHING` would return no row and need another SELECT.
+        """
+        stmt = sa_pg.insert(self.model)
+        return (
+            stmt.on_conflict_do_update(
+                index_elements=conflict_target,
+                set_={conflict_target[0]: stmt.excluded[conflict_target[0]]},
+            )
+            # xmax is 0 on inserted rows, while the row lock taken by DO UPDATE leaves it set on existing ones.
+            .returning(self.model, sa.literal_column("xmax = 0", sa.Boolean), sort_by_parameter_order=True)
+            .execution_options(populate_existing=True)
+        )
+
+    def get_upsert_rows(self, objs_in: typing.Iterable[CreateSchema]) -> list[dict[str, typing.Any]]:
+        rows = [obj_in.model_dump() for obj_in in objs_in]
+        self.check_not_nullable_many(rows)
+        return rows
+
+    def get_key(self, obj: CreateSchema | M, conflict_target: list[str]) -> tuple:
+        return tuple(getattr(obj, field) for field in conflict_target)
+
+    def get_key_chunks(
+        self, objs_in: typing.Iterable[CreateSchema], chunk_size: int
+    ) -> tuple[list[str], list[dict[tuple, CreateSchema]]]:
+        """Splits `objs_in` into chunks keyed by `__primary_fields__`, keeping only the first of duplicated keys."""
+        conflict_target: list[str] | None = None
+        objs_in_by_key: dict[tuple, CreateSchema] = {}
+        for obj_in in objs_in:
+            if conflict_target is None:
+                conflict_target = self.get_conflict_target(obj_in)
+            elif self.get_conflict_target(obj_in) != conflict_target:
+                raise ValueError("All of objs_in must have the same __primary_fields__")
+            objs_in_by_key.setdefault(self.get_key(obj_in, conflict_target), obj_in)
+
+        chunks = [dict(chunk) for chunk in itertools.batched(objs_in_by_key.items(), chunk_size)]
+        return conflict_target or [], chunks
+
+    def get_insert_or_ignore_query(self, conflict_target: list[str]) -> sa_pg.Insert:
+        """
+        `INSERT ... ON CONFLICT (conflict_target) DO NOTHING RETURNING *`, which only returns inserted rows.
+        Unlike the no-op update of get_upsert_query, existing rows are neither locked nor rewritten.
+        """
+        return (
+            sa_pg.insert(self.model)
+            .on_conflict_do_nothing(index_elements=conflict_target)
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        )
+
+    def get_select_using_keys_query(self, conflict_target: list[str], keys: list[tuple]) -> sa.Select:
+        columns = [self.model.__table__.c[field] for field in conflict_target]
+        if len(columns) == 1:
+            condition = columns[0] == sa.any_(sa.literal([key[0] for key in keys], sa_pg.ARRAY(columns[0].type)))
+        else:
+            condition = sa.tuple_(*columns).in_(keys)
+        return (
+            sa.select(self.model)
+            .where(condition)
+            .execution_options(populate_existing=True, **{src.db.soft_delete.INCLUDE_DELETED: True})
+        )
+
+    def merge_get_or_create_results(
+        self, conflict_target: list[str], keys: typing.Iterable[tuple], inserted: list[M], existing: list[M]
+    ) -> list[tuple[M, bool]]:
+        inserted_by_key = {self.get_key(db_obj, conflict_target): db_obj for db_obj in inserted}
+        existing_by_key = {self.get_key(db_obj, conflict_target): db_obj for db_obj in existing}
+        return [
+            (inserted_by_key[key], True) if key in inserted_by_key else (existing_by_key[key], False)
+            for key in keys
+            # A conflicting row may have been deleted right after the INSERT.
+            if key in inserted_by_key or key in existing_by_key
+        ]
 
-        stmt_filter = sa.and_(*[getattr(self.model, field) == getattr(obj_in, field) for field in primary_fields])
-        if db_obj := await self.get_using_query(session, sa.select(self.model).where(stmt_filter)):
-            return db_obj, False
-        return await self.create(session, obj_in=obj_in), True
+    def get_or_create(self, session: db_types.Ss, obj_in: CreateSchema) -> tuple[M, bool]:
+        """
+        Returns the row of `obj_in.__primary_fields__` and whether it was created, in a single statement.
+        Unlike a SELECT and an INSERT, concurrent calls never fail with a unique violation on those fields.
+        An existing row is returned as is, even when it is soft-deleted.
+        """
+        stmt = self.get_upsert_query(self.get_conflict_target(obj_in)).values(self.get_upsert_rows([obj_in])[0])
+        db_obj, created = session.execute(stmt).one()
+        session.commit()
+        return db_obj, created
+
+    async def get_or_create_async(self, session: db_types.As, obj_in: CreateSchema) -> tuple[M, bool]:
+        stmt = self.get_upsert_query(self.get_conflict_target(obj_in)).values(self.get_upsert_rows([obj_in])[0])
+        db_obj, created = (await session.execute(stmt)).one()
+        await session.commit()
+        return db_obj, created
+
+    def get_or_create_many(
+        self, session: db_types.Ss, objs_in: typing.Iterable[CreateSchema], *, chunk_size: int = 500
+    ) -> list[tuple[M, bool]]:
+        """
+        get_or_create for batch imports, and commits once after all chunks.
+        Each chunk is an `INSERT ... ON CONFLICT DO NOTHING RETURNING *`, and a SELECT of the rows it did not return,
+        so that existing rows are not rewritten as the no-op update of get_or_create would do.
+        Rows are returned in the order given, once per distinct `__primary_fields__`,
+        which must be the same for all of `objs_in`.
+        """
+        conflict_target, chunks = self.get_key_chunks(objs_in, chunk_size)
+        result: list[tuple[M, bool]] = []
+        for chunk in chunks:
+            stmt = self.get_insert_or_ignore_query(conflict_target)
+            inserted = list(session.scalars(stmt, self.get_upsert_rows(chunk.values())))
+            inserted_keys = {self.get_key(db_obj, conflict_target) for db_obj in inserted}
+
+            existing: list[M] = []
+            if missing_keys := [key for key in chunk if key not in inserted_keys]:
+                existing = list(session.scalars(self.get_select_using_keys_query(conflict_target, missing_keys)))
+            result.extend(self.merge_get_or_create_results(conflict_target, chunk, inserted, existing))
+        session.commit()
+        return result
+
+    async def get_or_create_many_async(
+        self, session: db_types.As, objs_in: typing.Iterable[CreateSchema], *, chunk_size: int = 500
+    ) -> list[tuple[M, bool]]:
+        conflict_target, chunks = self.get_key_chunks(objs_in, chunk_size)
+        result: list[tuple[M, bool]] = []
+        for chunk in chunks:
+            stmt = self.get_insert_or_ignore_query(conflict_target)
+            inserted = list(await session.scalars(stmt, self.get_upsert_rows(chunk.values())))
+            inserted_keys = {self.get_key(db_obj, conflict_target) for db_obj in inserted}
+
+            existing: list[M] = []
+            if missing_keys := [key for key in chunk if key not in inserted_keys]:
+                stmt = self.get_select_using_keys_query(conflict_target, missing_keys)
+                existing = list(await session.scalars(stmt))
+            result.extend(self.merge_get_or_create_results(conflict_target, chunk, inserted, existing))
+        await session.commit()
+        return result
 
     @typing.overload
-    def update(self, session: db_types.Ss, db_obj: M, obj_in: UpdateSchema) -> M: ...
+    def update(
+        self, session: db_types.Ss, db_obj: M, obj_in: UpdateSchema, *, commit_ids: typing.Collection[str] | None = None
+    ) -> M: ...
 
     @typing.overload
     def update(  # type: ignore[misc]
-        self, session: db_types.As, db_obj: M, obj_in: UpdateSchema
+        self, session: db_types.As, db_obj: M, obj_in: UpdateSchema, *, commit_ids: typing.Collection[str] | None = None
     ) -> typing.Awaitable[M]: ...
 
-    def update(self, session: db_types.Ps, db_obj: M, obj_in: UpdateSchema) -> M | typing.Awaitable[M]:
+    def update(
+        self, session: db_types.Ps, db_obj: M, obj_in: UpdateSchema, *, commit_ids: typing.Collection[str] | None = None
+    ) -> M | typing.Awaitable[M]:
+        """
+        Updates a loaded row. The flush only updates the row when its commit_id is still the loaded one,
+        and `commit_ids` additionally requires the loaded one to be one of the given, e.g. from `If-Match`.
+        """
         # The reason why we get db_obj instead of uuid is
         # because if we get uuid, we cannot support both sync and async as we need to call self.get first.
+        if commit_ids is not None and db_obj.commit_id not in commit_ids:
+            src.const.error.ClientError.RESOURCE_MODIFIED().raise_()
+
         for k, v in obj_in.model_dump().items():
             setattr(db_obj, k, v)
 
@@ -152,6 +519,78 @@ class CRUDBase(typing.Generic[M, CreateSchema, UpdateSchema]):
         session.commit()
         return db_obj
 
+    @typing.overload
+    def update_using_uuid(
+        self,
+        session: db_types.Ss,
+        uuid: uuid.UUID,
+        obj_in: UpdateSchema,
+        *,
+        commit_ids: typing.Collection[str] | None = None,
+    ) -> M | None: ...
+
+    @typing.overload
+    def update_using_uuid(  # type: ignore[misc]
+        self,
+        session: db_types.As,
+        uuid: uuid.UUID,
+        obj_in: UpdateSchema,
+        *,
+        commit_ids: typing.Collection[str] | None = None,
+    ) -> typing.Awaitable[M | None]: ...
+
+    def update_using_uuid(
+        self,
+        session: db_types.Ps,
+        uuid: uuid.UUID,
+        obj_in: UpdateSchema,
+        *,
+        commit_ids: typing.Collection[str] | None = None,
+    ) -> (M | None) | typing.Awaitable[M | None]:
+        """
+        Updates a live row with a single `UPDATE ... WHERE uuid = :uuid AND commit_id IN (:commit_ids) RETURNING *`,
+        without loading it first nor locking it. Returns None when no row matched,
+        i.e. when it does not exist or has been updated since one of `commit_ids` was read.
+        """
+        values = obj_in.model_dump()
+        self.check_not_nullable_many([values], partial=True)
+
+        stmt = (
+            sa.update(self.model)
+            .where(self.model.uuid == uuid, self.model.deleted_at.is_(None))
+            .values(values)
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        )
+        if commit_ids is not None:
+            stmt = stmt.where(self.model.commit_id.in_(commit_ids))
+
+        if session._is_asyncio:
+            return execute_and_commit(session, self.model, stmt)
+        db_obj = session.scalar(stmt)
+        session.commit()
+        return db_obj
+
+    @typing.overload
+    def update_many(
+        self, session: db_types.Ss, uuids: typing.Iterable[uuid.UUID], obj_in: UpdateSchema, *, chunk_size: int = 500
+    ) -> list[M]: ...
+
+    @typing.overload
+    def update_many(  # type: ignore[misc]
+        self, session: db_types.As, uuids: typing.Iterable[uuid.UUID], obj_in: UpdateSchema, *, chunk_size: int = 500
+    ) -> typing.Awaitable[list[M]]: ...
+
+    def update_many(
+        self, session: db_types.Ps, uuids: typing.Iterable[uuid.UUID], obj_in: UpdateSchema, *, chunk_size: int = 500
+    ) -> list[M] | typing.Awaitable[list[M]]:
+        """Applies the same changes to all given rows, and commits once after all chunks."""
+        values = obj_in.model_dump()
+        self.check_not_nullable_many([values], partial=True)
+
+        batches = self.get_uuids_batches(sa.update(self.model).values(values), uuids, chunk_size)
+        return self.execute_batches(session, batches, commit=True)
+
     @typing.overload
     def delete(self, session: db_types.Ss, uuid: uuid.UUID) -> sa.ScalarResult[M]: ...
 
@@ -163,8 +602,11 @@ class CRUDBase(typing.Generic[M, CreateSchema, UpdateSchema]):
     def delete(
         self, session: db_types.Ps, uuid: uuid.UUID
     ) -> sa.ScalarResult[M] | typing.Awaitable[sa.ScalarResult[M]]:
+        model = self.model
         return session.execute(
-            sa.update(self.model).where(self.model.uuid == uuid).values(deleted_at=sa.func.now()).returning(self.model)
+            sa.lambda_stmt(
+                lambda: sa.update(model).where(model.uuid == uuid).values(deleted_at=sa.func.now()).returning(model)
+            )
         )
 
     @typing.overload
@@ -178,7 +620,122 @@ class CRUDBase(typing.Generic[M, CreateSchema, UpdateSchema]):
     def hard_delete(
         self, session: db_types.Ps, uuid: uuid.UUID
     ) -> sa.ScalarResult[M] | typing.Awaitable[sa.ScalarResult[M]]:
-        return session.execute(sa.delete(self.model).where(self.model.uuid == uuid).returning(self.model))
+        model = self.model
+        return session.execute(sa.lambda_stmt(lambda: sa.delete(model).where(model.uuid == uuid).returning(model)))
+
+    @typing.overload
+    def delete_many(
+        self,
+        session: db_types.Ss,
+        uuids: typing.Iterable[uuid.UUID],
+        *,
+        chunk_size: int = 500,
+        returning: typing.Literal[True] = True,
+    ) -> list[M]: ...
+
+    @typing.overload
+    def delete_many(  # type: ignore[misc]
+        self,
+        session: db_types.As,
+        uuids: typing.Iterable[uuid.UUID],
+        *,
+        chunk_size: int = 500,
+        returning: typing.Literal[True] = True,
+    ) -> typing.Awaitable[list[M]]: ...
+
+    @typing.overload
+    def delete_many(
+        self,
+        session: db_types.Ss,
+        uuids: typing.Iterable[uuid.UUID],
+        *,
+        chunk_size: int = 500,
+        returning: typing.Literal[False],
+    ) -> None: ...
+
+    @typing.overload
+    def delete_many(  # type: ignore[misc]
+        self,
+        session: db_types.As,
+        uuids: typing.Iterable[uuid.UUID],
+        *,
+        chunk_size: int = 500,
+        returning: typing.Literal[False],
+    ) -> typing.Awaitable[None]: ...
+
+    def delete_many(
+        self,
+        session: db_types.Ps,
+        uuids: typing.Iterable[uuid.UUID],
+        *,
+        chunk_size: int = 500,
+        returning: bool = True,
+    ) -> list[M] | typing.Awaitable[list[M]] | None | typing.Awaitable[None]:
+        """
+        Without `returning`, deleted rows are not loaded back,
+        and chunks are sent in a single round trip on async sessions.
+        """
+        stmt = sa.update(self.model).values(deleted_at=sa.func.now())
+        if not returning:
+            return self.execute_in_pipeline(session, self.get_uuids_stmts(stmt, uuids, chunk_size))
+        return self.execute_batches(session, self.get_uuids_batches(stmt, uuids, chunk_size), commit=False)
+
+    @typing.overload
+    def hard_delete_many(
+        self,
+        session: db_types.Ss,
+        uuids: typing.Iterable[uuid.UUID],
+        *,
+        chunk_size: int = 500,
+        returning: typing.Literal[True] = True,
+    ) -> list[M]: ...
+
+    @typing.overload
+    def hard_delete_many(  # type: ignore[misc]
+        self,
+        session: db_types.As,
+        uuids: typing.Iterable[uuid.UUID],
+        *,
+        chunk_size: int = 500,
+        returning: typing.Literal[True] = True,
+    ) -> typing.Awaitable[list[M]]: ...
+
+    @typing.overload
+    def hard_delete_many(
+        self,
+        session: db_types.Ss,
+        uuids: typing.Iterable[uuid.UUID],
+        *,
+        chunk_size: int = 500,
+        returning: typing.Literal[False],
+    ) -> None: ...
+
+    @typing.overload
+    def hard_delete_many(  # type: ignore[misc]
+        self,
+        session: db_types.As,
+        uuids: typing.Iterable[uuid.UUID],
+        *,
+        chunk_size: int = 500,
+        returning: typing.Literal[False],
+    ) -> typing.Awaitable[None]: ...
+
+    def hard_delete_many(
+        self,
+        session: db_types.Ps,
+        uuids: typing.Iterable[uuid.UUID],
+        *,
+        chunk_size: int = 500,
+        returning: bool = True,
+    ) -> list[M] | typing.Awaitable[list[M]] | None | typing.Awaitable[None]:
+        """
+        Without `returning`, deleted rows are not loaded back,
+        and chunks are sent in a single round trip on async sessions.
+        """
+        stmt = sa.delete(self.model)
+        if not returning:
+            return self.execute_in_pipeline(session, self.get_uuids_stmts(stmt, uuids, chunk_size))
+        return self.execute_batches(session, self.get_uuids_batches(stmt, uuids, chunk_size), commit=False)
 
 
 class EmptySchema(pydantic.BaseModel): ...  # noqa: E701
@@ -1,61 +1,137 @@
-import contextlib
+import typing
 import uuid
 
-import argon2
 import sqlalchemy as sa
+import sqlalchemy.orm as sa_orm
 
+import redis.asyncio
+import src.const.account
 import src.const.error
 import src.const.jwt
 import src.const.redis
 import src.crud.__interface__ as crud_interface
 import src.db.__type__ as db_types
 import src.db.model.user as user_model
+import src.db.pipeline
+import src.db.soft_delete
+import src.db.write_behind
+import src.password_hasher
+import src.redis.signin_failure
 import src.schema.user as user_schema
 import src.util.string_util
 import src.util.time_util
 
 
 class UserCRUD(crud_interface.CRUDBase[user_model.User, user_schema.UserCreate, user_schema.UserUpdate]):
-    async def signin(self, session: db_types.As, user_ident: str, password: str) -> user_model.User:
+    async def create(  # type: ignore[override]
+        self,
+        session: db_types.As,
+        obj_in: user_schema.UserCreate,
+        password_hasher: src.password_hasher.AsyncPasswordHasher,
+    ) -> user_model.User:
+        password_hash = await password_hasher.hash(obj_in.password)
+        return await super().create(session=session, obj_in=obj_in.model_copy(update={"password": password_hash}))
+
+    def update_signin_state(self, session: db_types.As, user: user_model.User, **values: typing.Any) -> None:
+        """
+        Writes sign-in bookkeeping with an `UPDATE ... WHERE uuid = :uuid` instead of flushing the loaded row,
+        so that it does not fail with StaleDataError when the row has been updated since, e.g. by other sign-ins.
+        The UPDATE is queued to be sent with the next statements and COMMIT in a single round trip,
+        see src.db.pipeline.add_to_pipeline, so literal values are set on the loaded row instead of RETURNING.
+        """
+        src.db.pipeline.add_to_pipeline(
+            session, sa.update(user_model.User).where(user_model.User.uuid == user.uuid).values(values)
+        )
+        for key, value in values.items():
+            if not isinstance(value, sa_orm.QueryableAttribute):
+                sa_orm.attributes.set_committed_value(user, key, value)
+
+    async def signin(
+        self,
+        session: db_types.As,
+        redis_session: redis.asyncio.Redis,
+        write_behind: src.db.write_behind.WriteBehindBuffer,
+        password_hasher: src.password_hasher.AsyncPasswordHasher,
+        user_ident: str,
+        password: str,
+    ) -> user_model.User:
+        # Both lookups are cached lambda statements, so only `user_ident` is bound per signin.
         if user_ident.startswith("@"):
-            column, user_ident = user_model.User.username, user_ident[1:]
+            user_ident = user_ident[1:]
+            stmt = sa.lambda_stmt(lambda: sa.select(user_model.User).where(user_model.User.username == user_ident))
         elif "@" in user_ident and src.util.string_util.is_email(user_ident):
-            column, user_ident = user_model.User.email, user_ident
+            stmt = sa.lambda_stmt(lambda: sa.select(user_model.User).where(user_model.User.email == user_ident))
         else:
-            column, user_ident = user_model.User.username, user_ident
-
-        stmt = sa.select(self.model).where(column == user_ident)
+            stmt = sa.lambda_stmt(lambda: sa.select(user_model.User).where(user_model.User.username == user_ident))
 
-        if not (user := await session.scalar(stmt)):
+        # Deleted accounts are loaded too, to tell the user that the account has been deleted.
+        execution_options = {src.db.soft_delete.INCLUDE_DELETED: True}
+        if not (user := await session.scalar(stmt, execution_options=execution_options)):
             src.const.error.AuthNError.SIGNIN_USER_NOT_FOUND().raise_()
         elif error_msg := user.signin_disabled_reason_message:
             src.const.error.AuthNError.SIGNIN_FAILED(msg=error_msg, input=user_ident).raise_()
 
-        with contextlib.suppress(argon2.exceptions.VerifyMismatchError):
-            argon2.PasswordHasher().verify(user.password, password)
-            user.mark_as_signin_succeed()
-            return await crud_interface.commit_and_return(session=session, db_obj=user)
+        if await password_hasher.verify(user.password, password):
+            await src.redis.signin_failure.reset_signin_failure(redis_session=redis_session, user_uuid=user.uuid)
+            # 실패 횟수는 Redis에서 관리되므로, 로그인 성공 시각만 모아서 나중에 DB에 반영합니다.
+            await write_behind.touch(
+                user_model.User, user.uuid, session=session, last_signin_at=src.util.time_util.get_utcnow()
+            )
 
-        user.mark_as_signin_failed()
-        await session.commit()
+            if password_hasher.needs_rehash(user.password) and not password_hasher.is_saturated:
+                # 해시 파라미터가 변경된 경우, 비밀번호 변경 없이 새 파라미터로 다시 해싱합니다.
+                # Rehashing is not a modification of the account, so modified_at and commit_id(ETag) are kept.
+                # Sent with the sign-in history INSERT, see UserSignInHistoryCRUD.signin.
+                password_hash = await password_hasher.hash(password)
+                self.update_signin_state(
+                    session,
+                    user,
+                    password=password_hash,
+                    modified_at=user_model.User.modified_at,
+                    commit_id=user_model.User.commit_id,
+                )
+            return user
 
-        default_err_msg = user_model.SignInDisabledReason.WRONG_PASSWORD.value.format(**user.dict)
+        # 로그인 실패 횟수는 Redis에서만 세고, 계정이 잠기는 경우에만 DB에 기록합니다.
+        signin_fail_count = await src.redis.signin_failure.increment_signin_failure(
+            redis_session=redis_session, user_uuid=user.uuid
+        )
+        if signin_fail_count >= src.const.account.ALLOWED_SIGNIN_FAILURES:
+            self.update_signin_state(
+                session, user, **user_model.User.get_signin_failed_values(signin_fail_count=signin_fail_count)
+            )
+            await src.db.pipeline.execute_pipeline(session, commit=True)
+            await src.redis.signin_failure.reset_signin_failure(redis_session=redis_session, user_uuid=user.uuid)
+
+        leftover_signin_failed_attempt = src.const.account.ALLOWED_SIGNIN_FAILURES - signin_fail_count
+        default_err_msg = user_model.SignInDisabledReason.WRONG_PASSWORD.value.format(
+            **user.dict | {"leftover_signin_failed_attempt": leftover_signin_failed_attempt}
+        )
         error_msg = user.signin_disabled_reason_message or default_err_msg
         src.const.error.AuthNError.SIGNIN_FAILED(msg=error_msg, input=user_ident).raise_()
 
     async def update_password(
-        self, session: db_types.As, uuid: uuid.UUID, obj_in: user_schema.UserPasswordUpdate
+        self,
+        session: db_types.As,
+        redis_session: redis.asyncio.Redis,
+        password_hasher: src.password_hasher.AsyncPasswordHasher,
+        uuid: uuid.UUID,
+        obj_in: user_schema.UserPasswordUpdate,
     ) -> user_model.User:
         if not (user := await self.get(session=session, uuid=uuid)):
             src.const.error.AuthNError.AUTH_USER_NOT_FOUND().raise_()
 
-        user.set_password(
-            user_schema.UserPasswordUpdateForModel.model_validate_with_orm(
-                orm_obj=user,
-                data=obj_in.model_dump(),
-            ).new_password,
-        )
-        return await crud_interface.commit_and_return(session=session, db_obj=user)
+        new_password = user_schema.UserPasswordUpdateForModel.model_validate_with_orm(
+            orm_obj=user,
+            data=obj_in.model_dump(),
+        ).new_password
+        if not await password_hasher.verify(user.password, obj_in.original_password):
+            src.const.error.AuthNError.PASSWORD_CHANGE_WRONG_PASSWORD().raise_()
+
+        user.set_password(await password_hasher.hash(new_password))
+        await session.commit()
+        await src.redis.signin_failure.reset_signin_failure(redis_session=redis_session, user_uuid=user.uuid)
+        return user
 
 
 userCRUD = UserCRUD(model=user_model.User)
@@ -1,10 +1,17 @@
-import redis
+import uuid
+
+import sqlalchemy as sa
+
+import redis.asyncio
+import src.config.fastapi
 import src.const.error
 import src.const.jwt
-import src.const.redis
 import src.crud.__interface__ as crud_interface
 import src.db.__type__ as db_types
 import src.db.model.user as user_model
+import src.db.pipeline
+import src.db.write_behind
+import src.redis.token_revocation
 import src.schema.authn_history
 import src.schema.user as user_schema
 import src.util.string_util
@@ -19,15 +26,54 @@ class UserSignInHistoryCRUD(
     ]
 ):
     async def delete(  # type: ignore[override]
-        self, session: db_types.As, redis_session: redis.Redis, token: user_schema.UserJWTToken
+        self, session: db_types.As, redis_session: redis.asyncio.Redis, user_uuid: uuid.UUID, uuid: uuid.UUID
     ) -> None:
-        if not (db_obj := await self.get_using_token_obj(session=session, token=token)):
+        stmt = sa.select(self.model).where(
+            self.model.uuid == uuid,
+            self.model.user_uuid == user_uuid,
+            self.model.deleted_at.is_(None),
+        )
+        if not (db_obj := await self.get_using_query(session=session, query=stmt)):
             src.const.error.AuthNError.AUTH_HISTORY_NOT_FOUND().raise_()
         db_obj.deleted_at = db_obj.expires_at = src.util.time_util.get_utcnow()
         await session.commit()
 
-        redis_key = src.const.redis.RedisKeyType.TOKEN_REVOKED.as_redis_key(str(token.user))
-        redis_session.set(redis_key, "1", ex=src.const.jwt.UserJWTTokenType.refresh.value.expiration_delta)
+        await src.redis.token_revocation.revoke_token(
+            redis_session=redis_session,
+            jti=uuid,
+            expires_in=src.const.jwt.UserJWTTokenType.refresh.value.expiration_delta,
+        )
+
+    async def revoke_others(
+        self,
+        session: db_types.As,
+        redis_session: redis.asyncio.Redis,
+        token: user_schema.UserJWTToken,
+        config_obj: src.config.fastapi.FastAPISetting,
+    ) -> user_schema.RefreshToken:
+        """
+        Revokes every session of the user except the current one, using a single per-user revocation epoch.
+        As tokens of the current session are also issued before the epoch, new tokens are issued for it.
+        """
+        if not (db_obj := await self.get_using_token_obj(session=session, token=token)):
+            src.const.error.AuthNError.AUTH_HISTORY_NOT_FOUND().raise_()
+
+        now = src.util.time_util.get_utcnow()
+        await session.execute(
+            sa.update(self.model)
+            .where(self.model.user_uuid == token.user, self.model.uuid != token.jti, self.model.deleted_at.is_(None))
+            .values(deleted_at=now, expires_at=now)
+        )
+        # New expiration is set after the epoch, so that the reissued tokens are not revoked by the epoch.
+        db_obj.expires_at = (
+            src.util.time_util.get_utcnow() + src.const.jwt.UserJWTTokenType.refresh.value.expiration_delta
+        )
+        await session.commit()
+
+        await src.redis.token_revocation.revoke_user_tokens(
+            redis_session=redis_session, user=token.user, revoked_before=now
+        )
+        return user_schema.RefreshToken.from_orm(signin_history=db_obj, config_obj=config_obj)
 
     async def get_using_token_obj(
         self, session: db_types.As, token: user_schema.UserJWTToken
@@ -39,18 +85,24 @@ class UserSignInHistoryCRUD(
     async def signin(
         self, session: db_types.As, obj_in: src.schema.authn_history.UserSignInHistoryCreate
     ) -> user_schema.RefreshToken:
-        db_obj = await self.create(session=session, obj_in=obj_in)
-        return user_schema.RefreshToken.from_orm(signin_history=db_obj, config_obj=obj_in.config_obj)
+        # Every value is known before the INSERT, so it is sent without RETURNING nor loading the row back,
+        # in a pipeline with COMMIT and the user UPDATE queued by UserCRUD.signin if any.
+        values = self.get_insert_values(obj_in)
+        await src.db.pipeline.execute_pipeline(session, [sa.insert(self.model).values(values)], commit=True)
+        return user_schema.RefreshToken.from_orm(signin_history=self.model(**values), config_obj=obj_in.config_obj)
 
-    async def refresh(self, session: db_types.As, token: user_schema.RefreshToken) -> user_schema.RefreshToken:
+    async def refresh(
+        self, session: db_types.As, write_behind: src.db.write_behind.WriteBehindBuffer, token: user_schema.RefreshToken
+    ) -> user_schema.RefreshToken:
         if token.should_refresh:
             if not (db_obj := await self.get_using_token_obj(session=session, token=token)):
                 src.const.error.AuthNError.AUTH_HISTORY_NOT_FOUND().raise_()
             new_expires_at = (
                 src.util.time_util.get_utcnow() + src.const.jwt.UserJWTTokenType.refresh.value.expiration_delta
             )
-            token.exp = db_obj.expires_at = new_expires_at
-            await session.commit()
+            # Token's exp is what's actually checked, so the DB record can be updated later.
+            token.exp = new_expires_at
+            await write_behind.touch(self.model, db_obj.uuid, session=session, expires_at=new_expires_at)
         return token
 
 
@@ -1,3 +1,4 @@
+import asyncio
 import contextlib
 import logging
 import typing
@@ -8,6 +9,11 @@ import sqlalchemy.orm as sa_orm
 
 import src.db.__mixin__ as db_mixin
 import src.db.__type__ as db_type
+import src.db.instrumentation
+import src.db.pool
+import src.db.replica
+import src.db.soft_delete
+import src.util.struct.lazy_proxy
 import src.util.type_util
 
 logger = logging.getLogger(__name__)
@@ -15,12 +21,41 @@ logger = logging.getLogger(__name__)
 
 class DBConfigDescriptor(typing.Protocol):
     class SQLAlchemyConfigDescriptor(typing.Protocol):
-        def to_sqlalchemy_config(self) -> dict[str, typing.Any]: ...
+        class DBReplicaConfigDescriptor(typing.Protocol):
+            url: str
+            weight: int
+
+        replicas: list[DBReplicaConfigDescriptor]
+        replica_health_check_interval: float
+        pool_size: int
+        pool_warmup: int
+        pgbouncer: bool
+        prepared_max: int
+        slow_query_threshold: float | None
+        n_plus_one_threshold: int | None
+        soft_delete_filter: bool
+
+        def to_sqlalchemy_config(self, url: str | None = None) -> dict[str, typing.Any]: ...
 
     debug: bool
     sqlalchemy: SQLAlchemyConfigDescriptor
 
 
+def mark_session_written(session: sa_orm.Session, *args: typing.Any) -> None:
+    session.info["written"] = True
+
+
+def mark_session_written_on_execute(orm_execute_state: sa_orm.ORMExecuteState) -> None:
+    # Anything but SELECT, including textual SQL, is treated as a write to be on the safe side.
+    if not orm_execute_state.is_select:
+        mark_session_written(orm_execute_state.session)
+
+
+def has_session_written(session: sa_ext_asyncio.AsyncSession) -> bool:
+    # autoflush is off, so pending changes are flushed by the commit itself.
+    return bool(session.info.get("written") or session.new or session.dirty or session.deleted)
+
+
 class DB:
     config_obj: DBConfigDescriptor
     engine: sa.Engine | sa_ext_asyncio.AsyncEngine | None = None
@@ -30,6 +65,10 @@ class DB:
         | sa_ext_asyncio.async_sessionmaker[sa_ext_asyncio.AsyncSession]
     ) = None
 
+    @property
+    def session_info(self) -> dict[str, typing.Any]:
+        return {src.db.soft_delete.SOFT_DELETE_FILTER: self.config_obj.sqlalchemy.soft_delete_filter}
+
     def check_connection(self, session: db_type.Ps) -> None:
         """Check if DB is connected"""
         try:
@@ -38,6 +77,12 @@ class DB:
             logger.critical(f"DB connection failed: {e}")
             raise e
 
+    def set_prepared_max(self, dbapi_connection: typing.Any, connection_record: sa.pool.ConnectionPoolEntry) -> None:
+        # psycopg.connect does not take prepared_max, so it is set on every new connection.
+        driver_connection = connection_record.driver_connection
+        if hasattr(driver_connection, "prepared_max"):
+            driver_connection.prepared_max = self.config_obj.sqlalchemy.prepared_max
+
     def create_all_tables(self, session: db_type.Ps) -> None:
         """Create all tables only IF NOT EXISTS on debug mode"""
         if self.config_obj.debug:
@@ -54,8 +99,15 @@ class SyncDB(DB, src.util.type_util.SyncConnectedResource):
 
         if not self.engine:
             self.engine = sa.engine_from_config(configuration=config, prefix="")
+            sa.event.listen(self.engine, "connect", self.set_prepared_max)
         if not self.session_maker:
-            self.session_maker = sa_orm.session.sessionmaker(self.engine, autoflush=False, expire_on_commit=False)
+            self.session_maker = sa_orm.session.sessionmaker(
+                self.engine,
+                class_=src.db.soft_delete.SoftDeleteSession,
+                autoflush=False,
+                expire_on_commit=False,
+                info=self.session_info,
+            )
 
         with self.session_maker() as session:
             self.check_connection(session)
@@ -89,29 +141,118 @@ class SyncDB(DB, src.util.type_util.SyncConnectedResource):
 class AsyncDB(DB, src.util.type_util.AsyncConnectedResource):
     engine: sa_ext_asyncio.AsyncEngine | None = None
     session_maker: sa_ext_asyncio.async_sessionmaker[sa_ext_asyncio.AsyncSession] | None = None
+    read_session_maker: sa_ext_asyncio.async_sessionmaker[sa_ext_asyncio.AsyncSession] | None = None
+    replicas: tuple[src.db.replica.DBReplica, ...] = ()
+    health_checker: asyncio.Task | None = None
+    pool_telemetry: src.db.pool.PoolTelemetry | None = None
+    query_instrumentation: src.db.instrumentation.QueryInstrumentation | None = None
+
+    # Counters of lazy sessions, see get_lazy_async_session and get_async_read_session
+    lazy_sessions = 0
+    unused_lazy_sessions = 0
+    skipped_commits = 0
+    read_sessions = 0
+    unused_read_sessions = 0
 
     async def aopen(self) -> typing.Self:
+        if not self.query_instrumentation:
+            self.query_instrumentation = src.db.instrumentation.QueryInstrumentation(
+                slow_query_threshold=self.config_obj.sqlalchemy.slow_query_threshold,
+                n_plus_one_threshold=self.config_obj.sqlalchemy.n_plus_one_threshold,
+            )
+
         # Create DB engine and session pool.
-        config = self.config_obj.sqlalchemy.to_sqlalchemy_config()
         if not self.engine:
-            self.engine = sa_ext_asyncio.async_engine_from_config(configuration=config, prefix="")
+            self.engine = self.create_engine()
+            self.pool_telemetry = src.db.pool.PoolTelemetry(self.engine)
         if not self.session_maker:
-            self.session_maker = sa_ext_asyncio.async_sessionmaker(self.engine, autoflush=False, expire_on_commit=False)
+            self.session_maker = sa_ext_asyncio.async_sessionmaker(
+                self.engine,
+                sync_session_class=src.db.soft_delete.SoftDeleteSession,
+                autoflush=False,
+                expire_on_commit=False,
+                info=self.session_info,
+            )
 
         async with self.session_maker() as session:
             await session.run_sync(self.check_connection)
             await session.run_sync(self.create_all_tables)
 
+        self.replicas = tuple(
+            src.db.replica.DBReplica(engine=self.create_engine(url=replica_config.url), weight=replica_config.weight)
+            for replica_config in self.config_obj.sqlalchemy.replicas
+        )
+        if not self.read_session_maker:
+            self.read_session_maker = sa_ext_asyncio.async_sessionmaker(
+                self.engine,
+                sync_session_class=src.db.replica.ReplicaRoutingSession,
+                autoflush=False,
+                expire_on_commit=False,
+                info=self.session_info
+                | {
+                    "primary": self.engine,
+                    "readonly_primary": self.engine.execution_options(**src.db.replica.READ_ONLY_EXECUTION_OPTIONS),
+                    "replicas": self.replicas,
+                },
+            )
+        if self.replicas:
+            await asyncio.gather(*(replica.check_health() for replica in self.replicas))
+            self.health_checker = asyncio.create_task(self.check_replicas_health(), name="db-replica-health-checker")
+
+        if not self.config_obj.sqlalchemy.pgbouncer:
+            warmup_size = min(self.config_obj.sqlalchemy.pool_warmup, self.config_obj.sqlalchemy.pool_size)
+            engines = (self.engine, *(replica.engine for replica in self.replicas if replica.healthy))
+            await asyncio.gather(*(src.db.pool.warm_up(engine, warmup_size) for engine in engines))
+
         return self
 
+    def create_engine(self, url: str | None = None) -> sa_ext_asyncio.AsyncEngine:
+        config = {"poolclass": src.db.pool.InstrumentedAsyncAdaptedQueuePool}
+        config |= self.config_obj.sqlalchemy.to_sqlalchemy_config(url=url)
+        engine = sa_ext_asyncio.async_engine_from_config(configuration=config, prefix="")
+        sa.event.listen(engine.sync_engine, "connect", self.set_prepared_max)
+        if self.query_instrumentation:
+            self.query_instrumentation.attach(engine)
+        return engine
+
     async def aclose(self) -> None:
         # Close DB engine and session pool.
+        if self.health_checker:
+            self.health_checker.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.health_checker
+            self.health_checker = None
+        if self.read_session_maker:
+            self.read_session_maker = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+        self.replicas = ()
         if self.session_maker:
             self.session_maker = None
         if self.engine:
             await self.engine.dispose()
             self.engine = None
 
+    async def check_replicas_health(self) -> None:
+        while True:
+            await asyncio.sleep(self.config_obj.sqlalchemy.replica_health_check_interval)
+            await asyncio.gather(*(replica.check_health() for replica in self.replicas))
+
+    @property
+    def stats(self) -> dict[str, typing.Any]:
+        return {
+            "pool": self.pool_telemetry.stats if self.pool_telemetry else {},
+            "queries": self.query_instrumentation.stats if self.query_instrumentation else {},
+            "replicas": [replica.stats for replica in self.replicas],
+            "sessions": {
+                "lazy": self.lazy_sessions,
+                "unused_lazy": self.unused_lazy_sessions,
+                "skipped_commits": self.skipped_commits,
+                "read": self.read_sessions,
+                "unused_read": self.unused_read_sessions,
+            },
+        }
+
     @contextlib.asynccontextmanager
     async def get_async_session(self) -> typing.AsyncGenerator[sa_ext_asyncio.AsyncSession, None]:
         if not self.session_maker:
@@ -125,3 +266,66 @@ class AsyncDB(DB, src.util.type_util.AsyncConnectedResource):
                 raise se
             finally:
                 await session.close()
+
+    @contextlib.asynccontextmanager
+    async def get_lazy_async_session(
+        self, on_create: typing.Callable[[sa_ext_asyncio.AsyncSession], None] | None = None
+    ) -> typing.AsyncGenerator[sa_ext_asyncio.AsyncSession, None]:
+        """
+        Same as get_async_session, but the session is created on its first use,
+        and COMMIT is sent only when something was written.
+        """
+        if not self.session_maker:
+            raise RuntimeError("DB is not opened")
+
+        def create_session() -> sa_ext_asyncio.AsyncSession:
+            session = self.session_maker()
+            sa.event.listen(session.sync_session, "after_flush", mark_session_written)
+            sa.event.listen(session.sync_session, "do_orm_execute", mark_session_written_on_execute)
+            if on_create:
+                on_create(session)
+            return session
+
+        self.lazy_sessions += 1
+        lazy_session = src.util.struct.lazy_proxy.LazyProxy(create_session)
+        try:
+            yield typing.cast(sa_ext_asyncio.AsyncSession, lazy_session)
+            if lazy_session.is_created:
+                if has_session_written(lazy_session.target):
+                    await lazy_session.target.commit()
+                else:
+                    # The transaction is ended by the reset-on-return of the pool.
+                    self.skipped_commits += 1
+        except Exception as se:
+            if lazy_session.is_created:
+                await lazy_session.target.rollback()
+            raise se
+        finally:
+            if lazy_session.is_created:
+                await lazy_session.target.close()
+            else:
+                self.unused_lazy_sessions += 1
+
+    @contextlib.asynccontextmanager
+    async def get_async_read_session(
+        self, read_after_write: src.db.replica.ReadAfterWrite | None = None
+    ) -> typing.AsyncGenerator[sa_ext_asyncio.AsyncSession, None]:
+        """
+        Session in read-only transactions, on a replica if any is healthy, see src.db.replica.ReplicaRoutingSession.
+        Nothing is committed, and the session is created on its first use.
+        """
+        if not self.read_session_maker:
+            raise RuntimeError("DB is not opened")
+
+        read_session_maker = self.read_session_maker
+        self.read_sessions += 1
+        lazy_session = src.util.struct.lazy_proxy.LazyProxy(
+            lambda: read_session_maker(info={"read_after_write": read_after_write})
+        )
+        try:
+            yield typing.cast(sa_ext_asyncio.AsyncSession, lazy_session)
+        finally:
+            if lazy_session.is_created:
+                await lazy_session.target.close()
+            else:
+                self.unused_read_sessions += 1
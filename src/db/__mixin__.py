@@ -62,6 +62,15 @@ class DefaultModelMixin(sa_orm.DeclarativeBase):
     deleted_at: sa_orm.Mapped[db_types.DateTime_Nullable]
     commit_id: sa_orm.Mapped[str] = sa_orm.mapped_column(default=secrets.token_hex, onupdate=secrets.token_hex)
 
+    @sa_dec.declared_attr.directive
+    def __mapper_args__(cls) -> dict[str, typing.Any]:
+        # ORM flushes update with `WHERE uuid = :uuid AND commit_id = :loaded_commit_id`,
+        # and raise StaleDataError when someone else has updated the row since it was loaded.
+        # default/onupdate of commit_id are kept for Core-level INSERTs and UPDATEs, which skip this.
+        # Bookkeeping UPDATEs which are not modifications of the resource(e.g. write-behind touches)
+        # set commit_id and modified_at to themselves, so that ETags given to clients stay valid.
+        return {"version_id_col": cls.commit_id, "version_id_generator": lambda _: secrets.token_hex()}
+
     @property
     def dict(self) -> typing.Dict[str, typing.Any]:
         return src.util.sqlalchemy.orm2dict(self)
@@ -7,6 +7,8 @@ import sqlalchemy.ext.asyncio as sa_ext_asyncio
 import sqlalchemy.orm as sa_orm
 import sqlalchemy.sql.roles as sa_role
 
+import src.util.uuid_util
+
 Ss = typing.TypeVar("Ss", bound=sa_orm.Session)
 As = typing.TypeVar("As", bound=sa_ext_asyncio.AsyncSession)
 Ps = typing.TypeVar("Ps", sa_orm.Session, sa_ext_asyncio.AsyncSession)
@@ -26,9 +28,12 @@ def NullableForeignKeyTypeGenerator(columninfo: ColumnableType) -> PKRelatedType
     ]
 
 
-PrimaryKeyType = typing.Annotated[
-    uuid.UUID,
-    sa_orm.mapped_column(primary_key=True, default=uuid.uuid4, unique=True, index=True, nullable=False),
+# A primary key already has its own unique index, so unique=True or index=True would only add a duplicate one.
+PrimaryKeyType = typing.Annotated[uuid.UUID, sa_orm.mapped_column(primary_key=True, default=uuid.uuid4, nullable=False)]
+# Time-ordered primary key for insert-heavy tables, to opt in, redeclare `uuid` on the model with this type.
+# Only the default changes, so no migration is needed to switch, and existing uuid4 rows keep working.
+PrimaryKeyType_V7 = typing.Annotated[
+    uuid.UUID, sa_orm.mapped_column(primary_key=True, default=src.util.uuid_util.uuid7, nullable=False)
 ]
 
 Bool_DTrue = typing.Annotated[bool, sa_orm.mapped_column(default=True, nullable=False)]
@@ -0,0 +1,133 @@
+import collections
+import contextvars
+import logging
+import time
+import typing
+
+import sqlalchemy as sa
+import sqlalchemy.ext.asyncio as sa_ext_asyncio
+
+logger = logging.getLogger(__name__)
+
+
+class RequestQueryStats:
+    """Statements issued while handling a single request, set to request_query_stats by QueryStatsMiddleware."""
+
+    def __init__(self) -> None:
+        self.statements = 0
+        self.elapsed = 0.0
+        self.statement_counts: collections.Counter[str] = collections.Counter()
+        self.n_plus_one_suspects: list[str] = []
+
+    @property
+    def server_timing(self) -> str:
+        return f'db;dur={self.elapsed * 1000:.2f};desc="{self.statements} queries"'
+
+
+# SQLAlchemy runs the sync events of async engines in a greenlet which shares the context of the calling task.
+request_query_stats: contextvars.ContextVar[RequestQueryStats | None] = contextvars.ContextVar(
+    "request_query_stats", default=None
+)
+
+
+def redact_parameters(parameters: typing.Any) -> typing.Any:
+    """Replaces bound values with their type names, so that slow query logs don't leak user data."""
+    if isinstance(parameters, dict):
+        return {k: type(v).__name__ for k, v in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if parameters and isinstance(parameters[0], (dict, list, tuple)):
+            # executemany, the first row is enough to tell the shape.
+            return [redact_parameters(parameters[0]), f"... {len(parameters)} rows"]
+        return [type(v).__name__ for v in parameters]
+    return type(parameters).__name__
+
+
+class QueryInstrumentation:
+    """
+    Times every statement through cursor events of the engines given to `attach`.
+    Counts are kept per request in request_query_stats, and in total on this object for /statz.
+    A statement repeated `n_plus_one_threshold` times in a request is reported once as a likely N+1 query,
+    and statements slower than `slow_query_threshold` milliseconds are logged with their parameters redacted.
+    """
+
+    def __init__(
+        self, slow_query_threshold: float | None, n_plus_one_threshold: int | None, slow_query_log_size: int = 20
+    ) -> None:
+        self.slow_query_threshold = slow_query_threshold
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+        self.statements = 0
+        self.elapsed = 0.0
+        self.slow_queries = 0
+        self.n_plus_one_suspects = 0
+        self.recent_slow_queries: collections.deque[dict[str, typing.Any]] = collections.deque(
+            maxlen=slow_query_log_size
+        )
+
+    def attach(self, engine: sa_ext_asyncio.AsyncEngine | sa.Engine) -> None:
+        # Engines derived by execution_options(), e.g. read-only ones, share these listeners.
+        sync_engine = engine.sync_engine if isinstance(engine, sa_ext_asyncio.AsyncEngine) else engine
+        sa.event.listen(sync_engine, "before_cursor_execute", self.before_cursor_execute)
+        sa.event.listen(sync_engine, "after_cursor_execute", self.after_cursor_execute)
+        sa.event.listen(sync_engine, "handle_error", self.handle_error)
+
+    def before_cursor_execute(
+        self,
+        conn: sa.Connection,
+        cursor: typing.Any,
+        statement: str,
+        parameters: typing.Any,
+        context: sa.engine.ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    def after_cursor_execute(
+        self,
+        conn: sa.Connection,
+        cursor: typing.Any,
+        statement: str,
+        parameters: typing.Any,
+        context: sa.engine.ExecutionContext | None,
+        executemany: bool,
+    ) -> None:
+        elapsed = time.perf_counter() - conn.info["query_started_at"].pop()
+        self.statements += 1
+        self.elapsed += elapsed
+
+        if self.slow_query_threshold is not None and elapsed * 1000 >= self.slow_query_threshold:
+            self.slow_queries += 1
+            slow_query = {
+                "elapsed_ms": round(elapsed * 1000, 2),
+                "statement": statement,
+                "parameters": redact_parameters(parameters),
+            }
+            self.recent_slow_queries.append(slow_query)
+            logger.warning(f"Slow query ({slow_query['elapsed_ms']} ms): {statement} {slow_query['parameters']}")
+
+        if not (request_stats := request_query_stats.get()):
+            return
+        request_stats.statements += 1
+        request_stats.elapsed += elapsed
+
+        # Parameters are bound separately, so the statement text itself is the fingerprint.
+        request_stats.statement_counts[statement] += 1
+        if self.n_plus_one_threshold and request_stats.statement_counts[statement] == self.n_plus_one_threshold:
+            self.n_plus_one_suspects += 1
+            request_stats.n_plus_one_suspects.append(statement)
+            logger.warning(f"Possible N+1 query, executed {self.n_plus_one_threshold} times in a request: {statement}")
+
+    def handle_error(self, exception_context: sa.engine.ExceptionContext) -> None:
+        # after_cursor_execute is skipped when the statement fails.
+        if (conn := exception_context.connection) and (started_at := conn.info.get("query_started_at")):
+            started_at.pop()
+
+    @property
+    def stats(self) -> dict[str, typing.Any]:
+        return {
+            "statements": self.statements,
+            "elapsed_avg_ms": self.elapsed / self.statements * 1000 if self.statements else 0.0,
+            "slow_queries": self.slow_queries,
+            "n_plus_one_suspects": self.n_plus_one_suspects,
+            "recent_slow_queries": list(self.recent_slow_queries),
+        }
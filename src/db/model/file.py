@@ -1,3 +1,4 @@
+import sqlalchemy as sa
 import sqlalchemy.orm as sa_orm
 
 import src.db.__mixin__ as db_mixin
@@ -5,6 +6,20 @@ import src.db.__type__ as db_types
 
 
 class File(db_mixin.DefaultModelMixin):
+    # Keyset pagination of files per user, see CRUDBase.get_page_using_query.
+    # Soft-deleted rows are excluded by those queries, so they are left out of the index.
+    __table_args__ = (
+        sa.Index(
+            "ix_file_created_by_uuid_created_at_uuid_not_deleted",
+            "created_by_uuid",
+            "created_at",
+            "uuid",
+            postgresql_where=sa.text("deleted_at IS NULL"),
+        ),
+    )
+
+    uuid: sa_orm.Mapped[db_types.PrimaryKeyType_V7]  # Time-ordered, see db_types.PrimaryKeyType_V7
+
     mimetype: sa_orm.Mapped[db_types.Str_Nullable]
     path: sa_orm.Mapped[db_types.Str]  # S3 Key
     hash: sa_orm.Mapped[db_types.Str]
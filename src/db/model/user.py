@@ -3,7 +3,6 @@ from __future__ import annotations
 import enum
 import typing
 
-import argon2
 import sqlalchemy as sa
 import sqlalchemy.orm as sa_orm
 
@@ -86,7 +85,8 @@ class User(db_mixin.DefaultModelMixin):
 
         return None
 
-    def set_password(self, password: str) -> None:
+    def set_password(self, password_hash: str) -> None:
+        """비밀번호의 해시를 받아 저장합니다. 해싱은 src.password_hasher를 통해 미리 진행해주세요."""
         if self.locked_reason == SignInDisabledReason.TOO_MUCH_LOGIN_FAIL.value:
             # 잠긴 사유가 로그인 실패 횟수 초과인 경우에만 계정 잠금을 해제합니다.
             self.locked_at = None
@@ -94,24 +94,35 @@ class User(db_mixin.DefaultModelMixin):
 
         self.signin_fail_count = 0
         self.signin_failed_at = None
-        self.password = argon2.PasswordHasher().hash(password)
+        self.password = password_hash
         self.password_updated_at = src.util.time_util.get_utcnow()
 
-    def mark_as_signin_succeed(self) -> None:
-        self.signin_fail_count = 0
-        self.signin_failed_at = None
-        self.last_signin_at = src.util.time_util.get_utcnow()
+    @staticmethod
+    def get_signin_failed_values(signin_fail_count: int) -> dict[str, typing.Any]:
+        """로그인 실패 횟수는 Redis에서 관리되므로, 현재까지의 실패 횟수를 받아 반영할 값들을 반환합니다."""
+        now = src.util.time_util.get_utcnow()
+        values: dict[str, typing.Any] = {"signin_fail_count": signin_fail_count, "signin_failed_at": now}
 
-    def mark_as_signin_failed(self) -> None:
-        self.signin_fail_count += 1
-        self.signin_failed_at = src.util.time_util.get_utcnow()
-
-        if self.signin_fail_count >= src.const.account.ALLOWED_SIGNIN_FAILURES:
-            self.locked_at = src.util.time_util.get_utcnow()
-            self.locked_reason = SignInDisabledReason.TOO_MUCH_LOGIN_FAIL.value
+        if signin_fail_count >= src.const.account.ALLOWED_SIGNIN_FAILURES:
+            values |= {"locked_at": now, "locked_reason": SignInDisabledReason.TOO_MUCH_LOGIN_FAIL.value}
+        return values
 
 
 class UserSignInHistory(db_mixin.DefaultModelMixin):
+    # Keyset pagination of sign-in histories per user, see CRUDBase.get_page_using_query.
+    # Soft-deleted rows are excluded by those queries, so they are left out of the index.
+    __table_args__ = (
+        sa.Index(
+            "ix_usersigninhistory_user_uuid_created_at_uuid_not_deleted",
+            "user_uuid",
+            "created_at",
+            "uuid",
+            postgresql_where=sa.text("deleted_at IS NULL"),
+        ),
+    )
+
+    uuid: sa_orm.Mapped[db_types.PrimaryKeyType_V7]  # Time-ordered, see db_types.PrimaryKeyType_V7
+
     user_uuid: sa_orm.Mapped[db_types.UserFK]
 
     ip: sa_orm.Mapped[db_types.Str]
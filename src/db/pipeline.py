@@ -0,0 +1,66 @@
+import typing
+
+import psycopg
+import sqlalchemy as sa
+import sqlalchemy.ext.asyncio as sa_ext_asyncio
+
+# Key of Session.info, where statements queued by add_to_pipeline are kept until the next execute_pipeline.
+PIPELINE_STATEMENTS = "pipeline_statements"
+
+
+def check_pipelinable(statement: sa.Executable) -> None:
+    # Rows are fetched right after each execute, which would wait for the result and break the pipeline.
+    if not (isinstance(statement, sa.Insert | sa.Update | sa.Delete) and not len(statement.exported_columns)):
+        raise ValueError(f"Only INSERT, UPDATE and DELETE without RETURNING can be pipelined: {statement}")
+
+
+def add_to_pipeline(session: sa_ext_asyncio.AsyncSession, statement: sa.Executable) -> None:
+    """
+    Queues a statement on the session instead of executing it,
+    so that the next execute_pipeline of the session sends it before its own statements.
+    Queued statements are dropped if execute_pipeline is never called, so callers must make sure that it is.
+    """
+    check_pipelinable(statement)
+    session.info.setdefault(PIPELINE_STATEMENTS, []).append(statement)
+
+
+async def execute_pipeline(
+    session: sa_ext_asyncio.AsyncSession, statements: typing.Sequence[sa.Executable] = (), *, commit: bool = False
+) -> None:
+    """
+    Sends statements queued by add_to_pipeline and independent INSERT, UPDATE and DELETE statements
+    without RETURNING in psycopg pipeline mode, followed by COMMIT if `commit`,
+    so that they take a single round trip instead of one each.
+    Statements must not depend on each other's results, and if one fails, the whole transaction is aborted.
+
+    Statements are run by the session as usual, only on a connection in pipeline mode,
+    so that SQLAlchemy still processes parameters, fires events and owns the transaction.
+    Falls back to running them one by one on other drivers, or when libpq is older than 14.
+    """
+    for statement in statements:
+        check_pipelinable(statement)
+    statements = [*session.info.pop(PIPELINE_STATEMENTS, []), *statements]
+
+    # Pending ORM changes are flushed first, so that they are written before the statements.
+    await session.flush()
+    connection = await session.connection()
+
+    if connection.dialect.driver != "psycopg" or not psycopg.AsyncPipeline.is_supported():
+        for statement in statements:
+            await session.execute(statement)
+    else:
+        driver_connection = (await connection.get_raw_connection()).driver_connection
+        try:
+            # Results are awaited at once on COMMIT or when leaving the pipeline, which raises the first error if any.
+            async with driver_connection.pipeline():
+                for statement in statements:
+                    await session.execute(statement)
+                if commit:
+                    # COMMIT is queued in the pipeline too, which leaves nothing for the session commit below to send.
+                    await driver_connection.commit()
+        except psycopg.Error:
+            await session.rollback()
+            raise
+
+    if commit:
+        await session.commit()
@@ -0,0 +1,108 @@
+import asyncio
+import time
+import typing
+
+import sqlalchemy as sa
+import sqlalchemy.ext.asyncio as sa_ext_asyncio
+import sqlalchemy.pool as sa_pool
+
+
+class PoolTelemetry:
+    """Collects pool usage through pool events, see InstrumentedAsyncAdaptedQueuePool for the checkout wait time."""
+
+    def __init__(self, engine: sa_ext_asyncio.AsyncEngine) -> None:
+        self.engine = engine
+
+        self.connects = 0
+        self.invalidations = 0
+        self.checkouts = 0
+        self.checkout_wait_total = 0.0
+        self.checkout_wait_max = 0.0
+        self.in_use_peak = 0
+        self.overflow_peak = 0
+        self.connection_age_total = 0.0
+        self.connection_age_max = 0.0
+
+        # Listening on the engine keeps the listeners when the pool is recreated by engine.dispose().
+        sa.event.listen(engine.sync_engine, "connect", self.on_connect)
+        sa.event.listen(engine.sync_engine, "checkout", self.on_checkout)
+        sa.event.listen(engine.sync_engine, "invalidate", self.on_invalidate)
+        if isinstance(engine.pool, InstrumentedAsyncAdaptedQueuePool):
+            engine.pool.telemetry = self
+
+    def on_connect(self, dbapi_connection: typing.Any, connection_record: sa_pool.ConnectionPoolEntry) -> None:
+        self.connects += 1
+        connection_record.info["connected_at"] = time.monotonic()
+
+    def on_checkout(
+        self,
+        dbapi_connection: typing.Any,
+        connection_record: sa_pool.ConnectionPoolEntry,
+        connection_proxy: sa_pool.PoolProxiedConnection,
+    ) -> None:
+        self.checkouts += 1
+        connection_age = time.monotonic() - connection_record.info.get("connected_at", time.monotonic())
+        self.connection_age_total += connection_age
+        self.connection_age_max = max(self.connection_age_max, connection_age)
+
+        if isinstance(pool := self.engine.pool, sa_pool.QueuePool):
+            self.in_use_peak = max(self.in_use_peak, pool.checkedout())
+            self.overflow_peak = max(self.overflow_peak, pool.overflow())
+
+    def on_invalidate(
+        self, dbapi_connection: typing.Any, connection_record: sa_pool.ConnectionPoolEntry, exception: BaseException
+    ) -> None:
+        self.invalidations += 1
+
+    def record_checkout_wait(self, elapsed: float) -> None:
+        self.checkout_wait_total += elapsed
+        self.checkout_wait_max = max(self.checkout_wait_max, elapsed)
+
+    @property
+    def stats(self) -> dict[str, int | float]:
+        pool = self.engine.pool
+        is_queue_pool = isinstance(pool, sa_pool.QueuePool)
+        return {
+            "size": pool.size() if is_queue_pool else 0,
+            "in_use": pool.checkedout() if is_queue_pool else 0,
+            "overflow": pool.overflow() if is_queue_pool else 0,
+            "in_use_peak": self.in_use_peak,
+            "overflow_peak": self.overflow_peak,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "checkouts": self.checkouts,
+            "checkout_wait_avg_ms": self.checkout_wait_total / self.checkouts * 1000 if self.checkouts else 0.0,
+            "checkout_wait_max_ms": self.checkout_wait_max * 1000,
+            "connection_age_avg": self.connection_age_total / self.checkouts if self.checkouts else 0.0,
+            "connection_age_max": self.connection_age_max,
+        }
+
+
+class InstrumentedAsyncAdaptedQueuePool(sa_pool.AsyncAdaptedQueuePool):
+    """
+    Measures how long a checkout takes, including waiting for a free connection and pre-ping.
+    Pool events only fire once a connection is handed out, so they cannot tell this.
+    """
+
+    telemetry: PoolTelemetry | None = None
+
+    def connect(self) -> sa_pool.PoolProxiedConnection:
+        started_at = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            if self.telemetry:
+                self.telemetry.record_checkout_wait(time.perf_counter() - started_at)
+
+    def recreate(self) -> sa_pool.QueuePool:
+        pool = super().recreate()
+        pool.telemetry = self.telemetry
+        return pool
+
+
+async def warm_up(engine: sa_ext_asyncio.AsyncEngine, size: int) -> None:
+    """Opens `size` connections at once and returns them to the pool, so that first requests don't wait to connect."""
+    if size <= 0:
+        return
+    connections = await asyncio.gather(*(engine.connect() for _ in range(size)))
+    await asyncio.gather(*(connection.close() for connection in connections))
@@ -0,0 +1,134 @@
+import logging
+import time
+import typing
+
+import sqlalchemy as sa
+import sqlalchemy.ext.asyncio as sa_ext_asyncio
+import sqlalchemy.orm as sa_orm
+
+import src.db.pool
+import src.db.soft_delete
+
+logger = logging.getLogger(__name__)
+
+# Transactions begin with `BEGIN READ ONLY`, which needs no extra round trip unlike `SET TRANSACTION READ ONLY`.
+# SQLAlchemy resets this when the connection is returned to the pool.
+READ_ONLY_EXECUTION_OPTIONS: dict[str, typing.Any] = {"postgresql_readonly": True}
+
+
+class DBReplica:
+    def __init__(self, engine: sa_ext_asyncio.AsyncEngine, weight: int) -> None:
+        self.engine = engine
+        self.readonly_engine = engine.execution_options(**READ_ONLY_EXECUTION_OPTIONS)
+        self.weight = weight
+        self.current_weight = 0  # Used by smooth weighted round-robin, see pick_replica
+        self.healthy = False
+        self.pool_telemetry = src.db.pool.PoolTelemetry(engine)
+
+        self.picks = 0
+        self.failed_health_checks = 0
+
+    async def check_health(self) -> bool:
+        try:
+            async with self.engine.connect() as connection:
+                await connection.execute(sa.text("SELECT 1"))
+        except Exception as e:
+            if self.healthy:
+                logger.warning(f"DB replica {self.engine.url!r} is unhealthy: {e}")
+            self.healthy = False
+            self.failed_health_checks += 1
+        else:
+            if not self.healthy:
+                logger.info(f"DB replica {self.engine.url!r} is healthy")
+            self.healthy = True
+        return self.healthy
+
+    @property
+    def stats(self) -> dict[str, typing.Any]:
+        return {
+            "url": self.engine.url.render_as_string(hide_password=True),
+            "weight": self.weight,
+            "healthy": self.healthy,
+            "picks": self.picks,
+            "failed_health_checks": self.failed_health_checks,
+            "pool": self.pool_telemetry.stats,
+        }
+
+
+def pick_replica(replicas: typing.Sequence[DBReplica]) -> DBReplica | None:
+    """
+    Smooth weighted round-robin over the healthy replicas, as nginx does.
+    Picks are spread evenly, e.g. weights 5:1:1 give `a a b a c a a` rather than `a a a a a b c`.
+    """
+    if not (healthy_replicas := [r for r in replicas if r.healthy]):
+        return None
+
+    for replica in healthy_replicas:
+        replica.current_weight += replica.weight
+    picked = max(healthy_replicas, key=lambda r: r.current_weight)
+    picked.current_weight -= sum(r.weight for r in healthy_replicas)
+    picked.picks += 1
+    return picked
+
+
+class ReadAfterWrite:
+    """
+    Tracks the last write of a client, so that its reads go to the primary until replicas have caught up.
+    A write in the current request is detected by watching its write sessions,
+    and a write in a previous request is restored from the `written_at` passed in, e.g. from a cookie.
+    """
+
+    def __init__(
+        self,
+        window: float,
+        written_at: float | None = None,
+        on_write: typing.Callable[[float], None] | None = None,
+    ) -> None:
+        self.window = window
+        self.written_at = written_at
+        self.on_write = on_write
+        self.written_in_request = False
+
+    @property
+    def is_sticky(self) -> bool:
+        return self.written_at is not None and time.time() - self.written_at < self.window
+
+    def mark_written(self) -> None:
+        self.written_at = time.time()
+        if not self.written_in_request and self.on_write:
+            self.on_write(self.written_at)
+        self.written_in_request = True
+
+    def watch(self, session: sa_ext_asyncio.AsyncSession) -> None:
+        sa.event.listen(session.sync_session, "after_flush", lambda *_: self.mark_written())
+        sa.event.listen(session.sync_session, "do_orm_execute", self.on_orm_execute)
+
+    def on_orm_execute(self, orm_execute_state: sa_orm.ORMExecuteState) -> None:
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            self.mark_written()
+
+
+class ReplicaRoutingSession(src.db.soft_delete.SoftDeleteSession):
+    """
+    Session for read-only handlers, which runs its queries in read-only transactions
+    on one replica picked on the first query.
+    Queries go to the primary instead when no replica is healthy or when the client has just written something,
+    still in read-only transactions unless the session is (mistakenly) used to write.
+    """
+
+    def get_bind(  # type: ignore[override]
+        self, mapper: typing.Any = None, clause: sa.ClauseElement | None = None, **kwargs: typing.Any
+    ) -> sa.Engine:
+        primary: sa_ext_asyncio.AsyncEngine = self.info["primary"]
+        readonly_primary: sa_ext_asyncio.AsyncEngine = self.info["readonly_primary"]
+        read_after_write: ReadAfterWrite | None = self.info.get("read_after_write")
+
+        if self._flushing or isinstance(clause, sa.Insert | sa.Update | sa.Delete):
+            return primary.sync_engine
+        if read_after_write and read_after_write.is_sticky:
+            return readonly_primary.sync_engine
+
+        if "replica" not in self.info:
+            self.info["replica"] = pick_replica(self.info["replicas"])
+        replica: DBReplica | None = self.info["replica"]
+        return (replica.readonly_engine if replica else readonly_primary).sync_engine
@@ -0,0 +1,46 @@
+import typing
+
+import sqlalchemy as sa
+import sqlalchemy.orm as sa_orm
+
+import src.db.__mixin__ as db_mixin
+
+# Session info key which enables the filter on a session, e.g. `session_maker(info={SOFT_DELETE_FILTER: True})`.
+# Session makers of SyncDB and AsyncDB set this from the `soft_delete_filter` setting.
+SOFT_DELETE_FILTER = "soft_delete_filter"
+# Pass as an execution option to also load soft-deleted rows, e.g. `stmt.execution_options(include_deleted=True)`.
+INCLUDE_DELETED = "include_deleted"
+
+SOFT_DELETE_CRITERIA = sa_orm.with_loader_criteria(
+    db_mixin.DefaultModelMixin,
+    lambda cls: cls.deleted_at.is_(None),
+    include_aliases=True,
+)
+
+
+class SoftDeleteSession(sa_orm.Session):
+    """
+    Session which hides soft-deleted rows of every DefaultModelMixin subclass from its ORM SELECTs,
+    including relationship loads, when SOFT_DELETE_FILTER is set on its info.
+    UPDATE and DELETE are left untouched, so that hard deletes still work.
+    Core SELECTs without ORM entities are not affected either.
+    Queries must still exclude soft-deleted rows by themselves, as sessions don't filter them by default.
+    """
+
+
+@sa.event.listens_for(SoftDeleteSession, "do_orm_execute")
+def add_soft_delete_criteria(orm_execute_state: sa_orm.ORMExecuteState) -> None:
+    if (
+        not orm_execute_state.session.info.get(SOFT_DELETE_FILTER, False)
+        or not orm_execute_state.is_select
+        or orm_execute_state.is_column_load  # Refreshing an already loaded object
+        or orm_execute_state.execution_options.get(INCLUDE_DELETED, False)
+    ):
+        return
+
+    statement: typing.Any = orm_execute_state.statement
+    if isinstance(statement, sa.StatementLambdaElement):
+        # Added as a lambda, so that the cached lambda statement is not rebuilt on every execution.
+        orm_execute_state.statement = statement.add_criteria(lambda s: s.options(SOFT_DELETE_CRITERIA))
+    else:
+        orm_execute_state.statement = statement.options(SOFT_DELETE_CRITERIA)
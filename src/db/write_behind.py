@@ -0,0 +1,328 @@
+import asyncio
+import collections
+import contextlib
+import datetime
+import itertools
+import logging
+import time
+import typing
+import uuid
+
+import sqlalchemy as sa
+import sqlalchemy.ext.asyncio as sa_ext_asyncio
+
+import src.const.redis
+import src.db
+import src.db.__mixin__ as db_mixin
+import src.redis
+import src.util.type_util
+
+logger = logging.getLogger(__name__)
+
+# table name -> row uuid -> column name -> unix timestamp
+PendingRows = dict[str, dict[str, dict[str, float]]]
+
+# Only keeps the latest timestamp, so that a delayed touch never moves the value backward.
+# The table is also added to the registry, so that flushers know which hashes to pop without scanning keys.
+# KEYS[1] = hash key, KEYS[2] = registry key, ARGV = table name, field1, timestamp1, field2, timestamp2, ...
+SET_IF_GREATER_SCRIPT = """
+redis.call("SADD", KEYS[2], ARGV[1])
+for i = 2, #ARGV, 2 do
+    local current = redis.call("HGET", KEYS[1], ARGV[i])
+    if not current or tonumber(current) < tonumber(ARGV[i + 1]) then
+        redis.call("HSET", KEYS[1], ARGV[i], ARGV[i + 1])
+    end
+end
+return 0
+"""
+# Moves the hash to the processing key of the flusher, which is deleted only after the rows are written,
+# so that buffered touches survive a crash between popping them and committing the UPDATE.
+# Touches left on the processing key by a failed flush are merged with the new ones and claimed again.
+# KEYS[1] = hash key, KEYS[2] = processing key, KEYS[3] = processing registry key
+CLAIM_SCRIPT = """
+if redis.call("EXISTS", KEYS[1]) == 1 then
+    if redis.call("EXISTS", KEYS[2]) == 0 then
+        redis.call("RENAME", KEYS[1], KEYS[2])
+    else
+        local values = redis.call("HGETALL", KEYS[1])
+        for i = 1, #values, 2 do
+            local current = redis.call("HGET", KEYS[2], values[i])
+            if not current or tonumber(current) < tonumber(values[i + 1]) then
+                redis.call("HSET", KEYS[2], values[i], values[i + 1])
+            end
+        end
+        redis.call("DEL", KEYS[1])
+    end
+    redis.call("SADD", KEYS[3], KEYS[2])
+end
+return redis.call("HGETALL", KEYS[2])
+"""
+# Merges the processing key left by a crashed flusher back into the hash of the table.
+# KEYS[1] = processing key, KEYS[2] = hash key, KEYS[3] = processing registry key
+RECOVER_SCRIPT = """
+local values = redis.call("HGETALL", KEYS[1])
+for i = 1, #values, 2 do
+    local current = redis.call("HGET", KEYS[2], values[i])
+    if not current or tonumber(current) < tonumber(values[i + 1]) then
+        redis.call("HSET", KEYS[2], values[i], values[i + 1])
+    end
+end
+redis.call("DEL", KEYS[1])
+redis.call("SREM", KEYS[3], KEYS[1])
+return #values / 2
+"""
+
+
+class WriteBehindConfigDescriptor(typing.Protocol):
+    class WriteBehindPyConfigDescriptor(typing.Protocol):
+        mode: typing.Literal["sync", "redis", "memory"]
+        flush_interval: float
+        max_batch_size: int
+
+    write_behind: WriteBehindPyConfigDescriptor
+
+
+def merge_rows(target: PendingRows, source: PendingRows) -> None:
+    for table_name, rows in source.items():
+        for row_uuid, values in rows.items():
+            target_values = target.setdefault(table_name, {}).setdefault(row_uuid, {})
+            for column_name, timestamp in values.items():
+                target_values[column_name] = max(target_values.get(column_name, timestamp), timestamp)
+
+
+def build_touch_stmt(table: sa.Table, column_names: list[str], rows: list[tuple[str, dict[str, float]]]) -> sa.Update:
+    """Builds `UPDATE table SET col = GREATEST(table.col, v.col) FROM (VALUES ...) AS v WHERE table.uuid = v.uuid`."""
+    values_clause = sa.values(
+        sa.column("uuid", table.c.uuid.type),
+        *(sa.column(column_name, table.c[column_name].type) for column_name in column_names),
+        name="write_behind",
+    ).data(
+        [
+            (
+                uuid.UUID(row_uuid),
+                *(datetime.datetime.fromtimestamp(values[c], tz=datetime.UTC) for c in column_names),
+            )
+            for row_uuid, values in rows
+        ]
+    )
+    # A touch is not a modification of the row, so onupdate columns like modified_at and commit_id are kept as is.
+    kept_values = {c.name: c for c in table.c if c.onupdate is not None and c.name not in column_names}
+    stmt = (
+        sa.update(table)
+        .where(table.c.uuid == values_clause.c.uuid)
+        .values({c: sa.func.greatest(table.c[c], values_clause.c[c]) for c in column_names} | kept_values)
+    )
+    if "deleted_at" in table.c:
+        stmt = stmt.where(table.c.deleted_at.is_(None))
+    return stmt
+
+
+class WriteBehindBuffer(src.util.type_util.AsyncConnectedResource):
+    """
+    Coalesces "touch" updates of timestamp columns, and flushes them periodically in batched UPDATE statements.
+    Buffered values are kept on Redis or on memory depending on the configured durability mode.
+    """
+
+    config_obj: WriteBehindConfigDescriptor
+    flusher: asyncio.Task | None = None
+
+    def __init__(
+        self, config_obj: WriteBehindConfigDescriptor, async_db: src.db.AsyncDB, async_redis: src.redis.AsyncRedis
+    ) -> None:
+        self.config_obj = config_obj
+        self.async_db = async_db
+        self.async_redis = async_redis
+        self.mode = config_obj.write_behind.mode
+        self.flush_interval = config_obj.write_behind.flush_interval
+        self.max_batch_size = config_obj.write_behind.max_batch_size
+
+        self.pending: PendingRows = {}
+        self.flusher_id = uuid.uuid4().hex
+        self.touches = 0
+        self.flushes = 0
+        self.flushed_rows = 0
+        self.failures = 0
+        self.last_flush_ms = 0.0
+
+    async def aopen(self) -> typing.Self:
+        if self.mode != "sync":
+            self.flusher = asyncio.create_task(self.flush_periodically(), name="write-behind-flusher")
+        return self
+
+    async def aclose(self) -> None:
+        if self.flusher:
+            self.flusher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.flusher
+            self.flusher = None
+
+        # Flush on shutdown, so that nothing buffered on this worker is lost.
+        await self.flush()
+
+    def get_redis_key(self, table_name: str) -> str:
+        return src.const.redis.RedisKeyType.WRITE_BEHIND.as_redis_key(table_name)
+
+    def get_redis_processing_key(self, table_name: str) -> str:
+        return src.const.redis.RedisKeyType.WRITE_BEHIND.as_redis_key(f"{table_name}:{self.flusher_id}")
+
+    @property
+    def redis_registry_key(self) -> str:
+        # Set of table names which have been buffered, next to their hashes named `write_behind:<table name>`.
+        return src.const.redis.RedisKeyType.WRITE_BEHIND.value
+
+    @property
+    def redis_processing_registry_key(self) -> str:
+        # Set of processing keys named `write_behind:<table name>:<flusher id>` which have not been released yet.
+        return src.const.redis.RedisKeyType.WRITE_BEHIND.as_redis_key("processing")
+
+    async def touch(
+        self,
+        model: type[db_mixin.DefaultModelMixin],
+        uuid: uuid.UUID,
+        session: sa_ext_asyncio.AsyncSession | None = None,
+        **values: datetime.datetime,
+    ) -> None:
+        """
+        Buffers new values of timestamp columns of a row.
+        On sync mode, those are written in the transaction of `session` if given, which is committed by the caller.
+        """
+        table_name: str = model.__table__.name
+        rows: PendingRows = {table_name: {str(uuid): {k: v.timestamp() for k, v in values.items()}}}
+        self.touches += 1
+
+        match self.mode:
+            case "sync" if session:
+                for stmt, _ in self.get_touch_stmts(rows):
+                    await session.execute(stmt)
+            case "sync":
+                await self.write(rows)
+            case "memory":
+                merge_rows(self.pending, rows)
+            case "redis":
+                await self.write_to_redis(rows)
+
+    async def write_to_redis(self, rows: PendingRows) -> None:
+        async with self.async_redis.get_async_session() as session:
+            script = session.register_script(SET_IF_GREATER_SCRIPT)
+            for table_name, table_rows in rows.items():
+                args = itertools.chain.from_iterable(
+                    (f"{row_uuid}:{column_name}", timestamp)
+                    for row_uuid, values in table_rows.items()
+                    for column_name, timestamp in values.items()
+                )
+                await script(keys=[self.get_redis_key(table_name), self.redis_registry_key], args=[table_name, *args])
+
+    async def claim_from_redis(self) -> PendingRows:
+        rows: PendingRows = {}
+        async with self.async_redis.get_async_session() as session:
+            script = session.register_script(CLAIM_SCRIPT)
+            # Only a few tables are ever touched, and those are kept in the registry.
+            for table_name in (name.decode() for name in await session.smembers(self.redis_registry_key)):
+                values: list[bytes] = await script(
+                    keys=[
+                        self.get_redis_key(table_name),
+                        self.get_redis_processing_key(table_name),
+                        self.redis_processing_registry_key,
+                    ]
+                )
+                for field, timestamp in zip(values[::2], values[1::2]):
+                    row_uuid, column_name = field.decode().split(":", maxsplit=1)
+                    rows.setdefault(table_name, {}).setdefault(row_uuid, {})[column_name] = float(timestamp)
+        return rows
+
+    async def release_on_redis(self, table_names: typing.Iterable[str]) -> None:
+        processing_keys = [self.get_redis_processing_key(table_name) for table_name in table_names]
+        async with self.async_redis.get_async_session() as session:
+            async with session.pipeline(transaction=True) as pipeline:
+                pipeline.delete(*processing_keys)
+                pipeline.srem(self.redis_processing_registry_key, *processing_keys)
+                await pipeline.execute()
+
+    async def recover_on_redis(self) -> None:
+        """
+        Merges touches left on processing keys by crashed flushers back into the buffer.
+        A key still being flushed by a live flusher may be merged back too, which only writes those rows twice,
+        as touches are applied with GREATEST.
+        """
+        async with self.async_redis.get_async_session() as session:
+            script = session.register_script(RECOVER_SCRIPT)
+            for processing_key in (key.decode() for key in await session.smembers(self.redis_processing_registry_key)):
+                table_name = processing_key.split(":")[1]
+                recovered = await script(
+                    keys=[processing_key, self.get_redis_key(table_name), self.redis_processing_registry_key]
+                )
+                logger.warning(f"Recovered {recovered} write-behind touches of {table_name} from {processing_key}.")
+
+    def get_touch_stmts(self, rows: PendingRows) -> typing.Generator[tuple[sa.Update, int], None, None]:
+        """Yields touch statements with the number of rows each of them updates."""
+        tables = db_mixin.DefaultModelMixin.metadata.tables
+        for table_name, table_rows in rows.items():
+            # Rows touching the same set of columns can be updated with a single statement.
+            rows_by_columns: dict[tuple[str, ...], list[tuple[str, dict[str, float]]]]
+            rows_by_columns = collections.defaultdict(list)
+            for row_uuid, values in table_rows.items():
+                rows_by_columns[tuple(sorted(values))].append((row_uuid, values))
+
+            for column_names, column_rows in rows_by_columns.items():
+                for batch in itertools.batched(column_rows, self.max_batch_size):
+                    yield build_touch_stmt(tables[table_name], list(column_names), list(batch)), len(batch)
+
+    async def write(self, rows: PendingRows) -> int:
+        row_count = 0
+        async with self.async_db.get_async_session() as session:
+            for stmt, stmt_row_count in self.get_touch_stmts(rows):
+                await session.execute(stmt)
+                row_count += stmt_row_count
+        return row_count
+
+    async def flush(self) -> None:
+        started_at = time.perf_counter()
+        if self.mode == "memory":
+            rows, self.pending = self.pending, {}
+        elif self.mode == "redis":
+            rows = await self.claim_from_redis()
+        else:
+            return
+
+        if not rows:
+            return
+
+        try:
+            self.flushed_rows += await self.write(rows)
+            self.flushes += 1
+            if self.mode == "redis":
+                await self.release_on_redis(rows)
+        except Exception as e:
+            # Retry on the next flush. On redis mode, those are kept on the processing keys until then.
+            logger.error(f"Failed to flush write-behind buffer: {e}")
+            self.failures += 1
+            if self.mode == "memory":
+                merge_rows(self.pending, rows)
+        finally:
+            self.last_flush_ms = (time.perf_counter() - started_at) * 1000
+
+    async def flush_periodically(self) -> None:
+        if self.mode == "redis":
+            try:
+                await self.recover_on_redis()
+            except Exception as e:
+                logger.error(f"Failed to recover write-behind buffer: {e}")
+
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Write-behind flusher failed: {e}")
+
+    @property
+    def stats(self) -> dict[str, int | float | str]:
+        return {
+            "mode": self.mode,
+            "pending_rows": sum(len(rows) for rows in self.pending.values()),
+            "touches": self.touches,
+            "flushes": self.flushes,
+            "flushed_rows": self.flushed_rows,
+            "failures": self.failures,
+            "last_flush_ms": self.last_flush_ms,
+        }
@@ -1,19 +1,19 @@
 from __future__ import annotations
 
+import hashlib
 import typing
-import uuid
 
 import fastapi
 import fastapi.security
 import jwt
 import pydantic
 
-import redis
+import redis.asyncio
 import src.config.fastapi
 import src.const.cookie
-import src.const.redis
 import src.dependency.common as common_dep
 import src.dependency.header as header_dep
+import src.redis.token_revocation
 import src.schema.user as user_schema
 
 oauth2_password_scheme = fastapi.security.OAuth2PasswordBearer(
@@ -31,23 +31,30 @@ oauth2_password_scheme = fastapi.security.OAuth2PasswordBearer(
 TokenType = typing.TypeVar("TokenType", bound=user_schema.UserJWTToken)
 
 
-def check_token_revocation(redis_session: redis.Redis, jti: uuid.UUID) -> None:
-    redis_key: str = src.const.redis.RedisKeyType.TOKEN_REVOKED.as_redis_key(str(jti))
-    if redis_session.get(name=redis_key):
+async def check_token_revocation(
+    redis_session: redis.asyncio.Redis,
+    revocation_cache: src.redis.token_revocation.TokenRevocationCache,
+    token: user_schema.UserJWTToken,
+) -> None:
+    # Local revocation set is used unless it might be stale, so that the hot path does not touch Redis.
+    if (is_revoked := revocation_cache.is_revoked(token)) is None:
+        is_revoked = await src.redis.token_revocation.is_token_revoked_on_redis(redis_session, token)
+    if is_revoked:
         raise jwt.exceptions.InvalidTokenError("Token is revoked")
 
 
-def parse_token(
+async def parse_token(
     parser_cls: type[TokenType],
     token: str,
     key: str,
     ua: str,
     config_obj: src.config.fastapi.FastAPISetting,
-    redis_session: redis.Redis,
+    redis_session: redis.asyncio.Redis,
+    revocation_cache: src.redis.token_revocation.TokenRevocationCache,
 ) -> TokenType:
     try:
         token_obj = parser_cls.from_token(token=token, key=key, request_user_agent=ua, config_obj=config_obj)
-        check_token_revocation(redis_session=redis_session, jti=token_obj.jti)
+        await check_token_revocation(redis_session=redis_session, revocation_cache=revocation_cache, token=token_obj)
         return token_obj
     except pydantic.ValidationError as err:
         raise jwt.exceptions.InvalidTokenError("Token data is invalid") from err
@@ -57,25 +64,47 @@ def parse_token(
         raise jwt.exceptions.InvalidTokenError("Token is invalid") from err
 
 
-def get_access_token_or_none(
+def get_access_token_cache_key(token: str, csrf_token: str, user_agent: str) -> bytes:
+    # User-Agent is also a part of the key, so that a cache hit does not need to compare User-Agent again.
+    return hashlib.blake2b("\0".join((token, csrf_token, user_agent)).encode(), digest_size=32).digest()
+
+
+async def get_access_token_or_none(
     redis_session: common_dep.redisDI,
+    revocation_cache: common_dep.tokenRevocationCacheDI,
     config_obj: common_dep.settingDI,
+    token_cache: common_dep.accessTokenCacheDI,
     user_agent: header_dep.user_agent = None,
     csrf_token: header_dep.csrf_token = None,
     authorization: typing.Annotated[str | None, fastapi.Depends(oauth2_password_scheme)] = None,
 ) -> user_schema.AccessToken | None:
-    return (
-        parse_token(
-            parser_cls=user_schema.AccessToken,
-            token=authorization,
-            key=config_obj.secret_key.get_secret_value() + csrf_token,
-            ua=user_agent,
-            config_obj=config_obj,
-            redis_session=redis_session,
-        )
-        if all([user_agent, csrf_token, authorization])
-        else None
+    if not all([user_agent, csrf_token, authorization]):
+        return None
+
+    # Signature, claims and User-Agent of the cached token are already verified,
+    # so we only need to check whether the token is revoked or not.
+    cache_key = get_access_token_cache_key(token=authorization, csrf_token=csrf_token, user_agent=user_agent)
+    if token_obj := token_cache.get(cache_key):
+        try:
+            await check_token_revocation(
+                redis_session=redis_session, revocation_cache=revocation_cache, token=token_obj
+            )
+        except jwt.exceptions.InvalidTokenError:
+            token_cache.pop(cache_key)
+            raise
+        return token_obj
+
+    token_obj = await parse_token(
+        parser_cls=user_schema.AccessToken,
+        token=authorization,
+        key=config_obj.secret_key.get_secret_value() + csrf_token,
+        ua=user_agent,
+        config_obj=config_obj,
+        redis_session=redis_session,
+        revocation_cache=revocation_cache,
     )
+    token_cache.set(cache_key, token_obj, expires_at=token_obj.exp.timestamp())
+    return token_obj
 
 
 access_token_or_none_di = typing.Annotated[user_schema.AccessToken | None, fastapi.Depends(get_access_token_or_none)]
@@ -91,8 +120,9 @@ def get_access_token(access_token_or_none_di: access_token_or_none_di = None) ->
 access_token_di = typing.Annotated[user_schema.AccessToken, fastapi.Depends(get_access_token)]
 
 
-def get_refresh_token(
+async def get_refresh_token(
     redis_session: common_dep.redisDI,
+    revocation_cache: common_dep.tokenRevocationCacheDI,
     config_obj: common_dep.settingDI,
     ua: header_dep.user_agent = None,
     refresh_token: typing.Annotated[str | None, src.const.cookie.CookieKey.REFRESH_TOKEN.as_cookie()] = None,
@@ -100,13 +130,14 @@ def get_refresh_token(
     if not all([ua, refresh_token]):
         raise jwt.exceptions.InvalidTokenError("User-Agent or Token is not provided")
 
-    return parse_token(
+    return await parse_token(
         parser_cls=user_schema.RefreshToken,
         token=refresh_token,
         key=config_obj.secret_key.get_secret_value(),
         ua=ua,
         config_obj=config_obj,
         redis_session=redis_session,
+        revocation_cache=revocation_cache,
     )
 
 
@@ -1,14 +1,25 @@
+import datetime
 import typing
 
 import fastapi
 import sqlalchemy.ext.asyncio as sa_ext_asyncio
 
-import redis
+import redis.asyncio
 import src.config.fastapi
+import src.const.cookie
 import src.db
+import src.db.replica
+import src.db.write_behind
+import src.password_hasher
 import src.redis
+import src.redis.token_revocation
+import src.schema.user as user_schema
+import src.util.fastapi.cookie
+import src.util.struct.expiring_lru_cache
 import src.util.time_util
 
+AccessTokenCache = src.util.struct.expiring_lru_cache.ExpiringLRUCache[bytes, user_schema.AccessToken]
+
 
 def fastapi_setting_di(request: fastapi.Request) -> typing.Generator[src.config.fastapi.FastAPISetting, None, None]:
     fastapi_app: fastapi.FastAPI = request.app
@@ -16,20 +27,100 @@ def fastapi_setting_di(request: fastapi.Request) -> typing.Generator[src.config.
     yield config_obj
 
 
-async def async_db_session_di(request: fastapi.Request) -> typing.AsyncGenerator[sa_ext_asyncio.AsyncSession, None]:
+def read_after_write_di(
+    request: fastapi.Request,
+    response: fastapi.Response,
+    db_written_at: typing.Annotated[str | None, src.const.cookie.CookieKey.DB_WRITTEN_AT.as_cookie()] = None,
+) -> src.db.replica.ReadAfterWrite:
+    fastapi_app: fastapi.FastAPI = request.app
+    config_obj: src.config.fastapi.FastAPISetting = fastapi_app.state.config_obj
+    window = config_obj.sqlalchemy.read_your_writes_window
+
+    def set_db_written_at_cookie(written_at: float) -> None:
+        if not config_obj.sqlalchemy.replicas:
+            return
+        src.util.fastapi.cookie.Cookie(
+            **config_obj.to_cookie_config(),
+            **src.const.cookie.CookieKey.DB_WRITTEN_AT.to_cookie_config(),
+            value=str(written_at),
+            expires=src.util.time_util.get_utcnow() + datetime.timedelta(seconds=window),
+        ).set_cookie(response)
+
+    try:
+        written_at = float(db_written_at) if db_written_at else None
+    except ValueError:
+        written_at = None
+    return src.db.replica.ReadAfterWrite(window=window, written_at=written_at, on_write=set_db_written_at_cookie)
+
+
+readAfterWriteDI = typing.Annotated[src.db.replica.ReadAfterWrite, fastapi.Depends(read_after_write_di)]
+
+
+async def async_db_session_di(
+    request: fastapi.Request,
+    read_after_write: readAfterWriteDI,
+) -> typing.AsyncGenerator[sa_ext_asyncio.AsyncSession, None]:
     fastapi_app: fastapi.FastAPI = request.app
     async_db: src.db.AsyncDB = fastapi_app.state.async_db
-    async with async_db.get_async_session() as session:
+    async with async_db.get_lazy_async_session(on_create=read_after_write.watch) as session:
         yield session
 
 
-async def async_redis_session_di(request: fastapi.Request) -> typing.AsyncGenerator[redis.Redis, None]:
+async def async_db_readonly_session_di(
+    request: fastapi.Request,
+    read_after_write: readAfterWriteDI,
+) -> typing.AsyncGenerator[sa_ext_asyncio.AsyncSession, None]:
+    fastapi_app: fastapi.FastAPI = request.app
+    async_db: src.db.AsyncDB = fastapi_app.state.async_db
+    async with async_db.get_async_read_session(read_after_write) as session:
+        yield session
+
+
+def async_db_di(request: fastapi.Request) -> src.db.AsyncDB:
+    fastapi_app: fastapi.FastAPI = request.app
+    return fastapi_app.state.async_db
+
+
+async def async_redis_session_di(request: fastapi.Request) -> typing.AsyncGenerator[redis.asyncio.Redis, None]:
     fastapi_app: fastapi.FastAPI = request.app
     async_redis: src.redis.AsyncRedis = fastapi_app.state.async_redis
     async with async_redis.get_async_session() as session:
         yield session
 
 
+def password_hasher_di(request: fastapi.Request) -> src.password_hasher.AsyncPasswordHasher:
+    fastapi_app: fastapi.FastAPI = request.app
+    return fastapi_app.state.password_hasher
+
+
+def write_behind_di(request: fastapi.Request) -> src.db.write_behind.WriteBehindBuffer:
+    fastapi_app: fastapi.FastAPI = request.app
+    return fastapi_app.state.write_behind
+
+
+def token_revocation_cache_di(request: fastapi.Request) -> src.redis.token_revocation.TokenRevocationCache:
+    fastapi_app: fastapi.FastAPI = request.app
+    return fastapi_app.state.token_revocation_cache
+
+
+def access_token_cache_di(request: fastapi.Request) -> AccessTokenCache:
+    fastapi_app: fastapi.FastAPI = request.app
+    return fastapi_app.state.access_token_cache
+
+
 dbDI = typing.Annotated[sa_ext_asyncio.AsyncSession, fastapi.Depends(async_db_session_di)]
-redisDI = typing.Annotated[redis.Redis, fastapi.Depends(async_redis_session_di)]
+# For read-only handlers, queries run in read-only transactions which are never committed,
+# and go to a replica unless the client has just written something.
+dbReadOnlyDI = typing.Annotated[sa_ext_asyncio.AsyncSession, fastapi.Depends(async_db_readonly_session_di)]
+asyncDBDI = typing.Annotated[src.db.AsyncDB, fastapi.Depends(async_db_di)]
+redisDI = typing.Annotated[redis.asyncio.Redis, fastapi.Depends(async_redis_session_di)]
 settingDI = typing.Annotated[src.config.fastapi.FastAPISetting, fastapi.Depends(fastapi_setting_di)]
+passwordHasherDI = typing.Annotated[src.password_hasher.AsyncPasswordHasher, fastapi.Depends(password_hasher_di)]
+writeBehindDI = typing.Annotated[src.db.write_behind.WriteBehindBuffer, fastapi.Depends(write_behind_di)]
+tokenRevocationCacheDI = typing.Annotated[
+    src.redis.token_revocation.TokenRevocationCache, fastapi.Depends(token_revocation_cache_di)
+]
+accessTokenCacheDI = typing.Annotated[AccessTokenCache, fastapi.Depends(access_token_cache_di)]
+
+pageCursorQuery = typing.Annotated[str | None, fastapi.Query(description="이전 페이지 응답의 next_cursor")]
+pageLimitQuery = typing.Annotated[int, fastapi.Query(ge=1, le=100)]
@@ -4,6 +4,7 @@ import fastapi
 
 import src.const.cookie
 import src.const.header
+import src.util.fastapi.etag
 
 
 def get_user_ip(
@@ -14,6 +15,14 @@ def get_user_ip(
     return real_ip or forwarded_for or (request.client.host if request.client else None)
 
 
+def get_if_match(
+    if_match: typing.Annotated[str | None, src.const.header.HeaderKey.IF_MATCH.as_header()] = None,
+) -> list[str] | None:
+    return src.util.fastapi.etag.parse_if_match(if_match)
+
+
 user_ip = typing.Annotated[str | None, fastapi.Depends(get_user_ip)]
+if_match = typing.Annotated[list[str] | None, fastapi.Depends(get_if_match)]
+accept = typing.Annotated[str | None, src.const.header.HeaderKey.ACCEPT.as_header()]
 user_agent = typing.Annotated[str | None, src.const.header.HeaderKey.USER_AGENT.as_header()]
 csrf_token = typing.Annotated[str | None, src.const.cookie.CookieKey.CSRF_TOKEN.as_cookie()]
@@ -4,6 +4,7 @@ import re
 
 import psycopg.errors as pg_exc
 import sqlalchemy.exc as sa_exc
+import sqlalchemy.orm.exc as sa_orm_exc
 
 import src.const.error
 import src.db.__mixin__ as db_mixin
@@ -71,6 +72,12 @@ async def psycopg_criticalerror_handler(req: err_type.ReqType, err: pg_exc.Error
     return src.const.error.DBServerError.DB_CRITICAL_ERROR().response()
 
 
+async def sqlalchemy_staledataerror_handler(req: err_type.ReqType, err: sa_orm_exc.StaleDataError) -> err_type.RespType:
+    # Raised by a flush when the row has been updated by someone else since it was loaded, see DefaultModelMixin.
+    # Not 412, as the client has not sent any precondition; those sent with If-Match are checked by the routes.
+    return src.const.error.ClientError.RESOURCE_CONFLICT().response()
+
+
 async def sqlalchemy_error_handler(req: err_type.ReqType, err: sa_exc.SQLAlchemyError) -> err_type.RespType:
     orig_exception: pg_exc.Error | BaseException | None  # For sa_exc.IntegrityError
     if orig_exception := getattr(err, "orig", None):
@@ -113,5 +120,6 @@ error_handler_patterns = {
     # PostgreSQL Database Error
     pg_exc.Error: psycopg_databaseerror_handler,
     # SQLAlchemy Error
+    sa_orm_exc.StaleDataError: sqlalchemy_staledataerror_handler,
     sa_exc.SQLAlchemyError: sqlalchemy_error_handler,
 }
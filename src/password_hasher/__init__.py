@@ -0,0 +1,149 @@
+import asyncio
+import concurrent.futures
+import logging
+import multiprocessing
+import os
+import time
+import typing
+
+import argon2
+
+import src.const.error
+import src.util.type_util
+
+logger = logging.getLogger(__name__)
+
+_worker_hasher: argon2.PasswordHasher | None = None
+
+
+class PasswordHasherConfigDescriptor(typing.Protocol):
+    class PasswordHasherPyConfigDescriptor(typing.Protocol):
+        max_workers: int | None
+        max_pending: int
+
+        def to_argon2_config(self) -> dict[str, typing.Any]: ...
+
+    password_hasher: PasswordHasherPyConfigDescriptor
+
+
+def _initialize_worker(argon2_config: dict[str, typing.Any]) -> None:
+    global _worker_hasher
+    _worker_hasher = argon2.PasswordHasher(**argon2_config)
+
+
+def _warm_up() -> None:
+    return None
+
+
+def _hash(password: str) -> str:
+    return _worker_hasher.hash(password)
+
+
+def _verify(password_hash: str, password: str) -> bool:
+    try:
+        return _worker_hasher.verify(password_hash, password)
+    except (argon2.exceptions.VerificationError, argon2.exceptions.InvalidHashError):
+        # A malformed stored hash is rejected like a wrong password instead of failing the sign-in with 500.
+        return False
+
+
+def get_default_max_workers() -> int:
+    # Pools of all API worker processes share the CPUs, gunicorn reads its number of workers from WEB_CONCURRENCY.
+    web_concurrency = int(os.environ.get("WEB_CONCURRENCY", 1))
+    return max(1, (os.cpu_count() or 1) // max(web_concurrency, 1))
+
+
+class AsyncPasswordHasher(src.util.type_util.AsyncConnectedResource):
+    """
+    Runs Argon2 hashing and verification on a process pool, so that those CPU-bound jobs don't block the event loop.
+    Jobs are rejected with 503 when more than `max_pending` jobs are waiting for a worker.
+    """
+
+    config_obj: PasswordHasherConfigDescriptor
+    executor: concurrent.futures.ProcessPoolExecutor | None = None
+
+    def __init__(self, config_obj: PasswordHasherConfigDescriptor) -> None:
+        self.config_obj = config_obj
+        self.max_workers = config_obj.password_hasher.max_workers or get_default_max_workers()
+        self.max_pending = config_obj.password_hasher.max_pending
+        # Only used for parsing parameters of the hash, hashing and verification are done on the worker processes.
+        self.hasher = argon2.PasswordHasher(**config_obj.password_hasher.to_argon2_config())
+
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    async def aopen(self) -> typing.Self:
+        # Use spawn instead of fork, as forking a process which is running an event loop is not safe.
+        self.executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_initialize_worker,
+            initargs=(self.config_obj.password_hasher.to_argon2_config(),),
+        )
+        # Spawn all workers now, so that the first requests don't have to wait for the worker processes to boot.
+        await asyncio.gather(*(asyncio.wrap_future(self.executor.submit(_warm_up)) for _ in range(self.max_workers)))
+        return self
+
+    async def aclose(self) -> None:
+        if self.executor:
+            await asyncio.to_thread(self.executor.shutdown, wait=True, cancel_futures=True)
+            self.executor = None
+
+    async def _run(self, func: typing.Callable[..., typing.Any], *args: typing.Any) -> typing.Any:
+        if not self.executor:
+            raise RuntimeError("Password hasher is not opened")
+
+        if self.is_saturated:
+            self.rejected += 1
+            logger.warning(f"Password hasher is saturated: {self.stats}")
+            src.const.error.ServerError.SERVER_BUSY().raise_()
+
+        started_at = time.perf_counter()
+        self.in_flight += 1
+        try:
+            future = self.executor.submit(func, *args)
+            result = await asyncio.wrap_future(future)
+        except BaseException:
+            # e.g. invalid hashes, broken pools or cancelled requests, which must not skew the latency.
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+        latency = time.perf_counter() - started_at
+        self.completed += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        return result
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password)
+
+    async def verify(self, password_hash: str, password: str) -> bool:
+        return await self._run(_verify, password_hash, password)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """Returns True if the hash was not made with the configured parameters."""
+        return self.hasher.check_needs_rehash(password_hash)
+
+    @property
+    def is_saturated(self) -> bool:
+        return self.in_flight >= self.max_workers + self.max_pending
+
+    @property
+    def stats(self) -> dict[str, int | float]:
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "in_flight": self.in_flight,
+            "queue_depth": max(self.in_flight - self.max_workers, 0),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "avg_latency_ms": self.total_latency / self.completed * 1000 if self.completed else 0.0,
+            "max_latency_ms": self.max_latency * 1000,
+        }
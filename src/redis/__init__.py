@@ -5,6 +5,8 @@ import typing
 import pydantic
 
 import redis
+import redis.asyncio
+import src.util.struct.lazy_proxy
 import src.util.type_util
 
 logger = logging.getLogger(__name__)
@@ -15,13 +17,15 @@ class RedisConfigDescriptor(typing.Protocol):
         dsn: pydantic.RedisDsn
         uri: str | None
 
+        def to_redis_config(self) -> dict[str, typing.Any]: ...
+
     debug: bool
     redis: RedisPyConfigDescriptor
 
 
 class Redis:
     config_obj: RedisConfigDescriptor
-    connection_pool: redis.ConnectionPool | None = None
+    connection_pool: redis.ConnectionPool | redis.asyncio.ConnectionPool | None = None
 
     def check_connection(self, session: redis.Redis) -> None:
         """Check if redis is connected"""
@@ -38,9 +42,11 @@ class Redis:
 
 
 class SyncRedis(Redis, src.util.type_util.SyncConnectedResource):
+    connection_pool: redis.ConnectionPool | None = None
+
     def open(self) -> typing.Self:
         # Create redis connection pool.
-        self.connection_pool = redis.ConnectionPool.from_url(url=self.config_obj.redis.uri)
+        self.connection_pool = redis.ConnectionPool.from_url(**self.config_obj.redis.to_redis_config())
 
         with redis.Redis(connection_pool=self.connection_pool) as client:
             self.check_connection(client)
@@ -58,28 +64,61 @@ class SyncRedis(Redis, src.util.type_util.SyncConnectedResource):
 
 
 class AsyncRedis(Redis, src.util.type_util.AsyncConnectedResource):
-    """
-    Redis connection pool wrapper for async.
-    Actually, this class does not support async properly, as it uses sync redis client.
-    (AsyncRedis is just for using with FastAPI dependency injection.)
-    But it is enough for now.
-    """
+    """Redis connection pool wrapper for async, backed by redis.asyncio."""
+
+    connection_pool: redis.asyncio.ConnectionPool | None = None
+
+    # Counters of lazy clients, see get_async_session
+    sessions = 0
+    unused_sessions = 0
+
+    async def check_connection(self, session: redis.asyncio.Redis) -> None:  # type: ignore[override]
+        """Check if redis is connected"""
+        try:
+            await session.ping()
+        except Exception as e:
+            logger.critical(f"Redis connection failed: {e}")
+            raise e
+
+    async def flush_all_keys(self, session: redis.asyncio.Redis) -> None:  # type: ignore[override]
+        """Flush all keys on debug mode"""
+        if self.config_obj.debug:
+            await session.flushdb()
 
     async def aopen(self) -> typing.Self:
         # Create redis connection pool.
-        self.connection_pool = redis.ConnectionPool.from_url(url=self.config_obj.redis.uri)
+        self.connection_pool = redis.asyncio.ConnectionPool.from_url(**self.config_obj.redis.to_redis_config())
 
-        with redis.Redis(connection_pool=self.connection_pool) as client:
-            self.check_connection(client)
-            self.flush_all_keys(client)
+        async with redis.asyncio.Redis(connection_pool=self.connection_pool) as client:
+            await self.check_connection(client)
+            await self.flush_all_keys(client)
 
         return self
 
     async def aclose(self) -> None:
-        self.connection_pool.disconnect(inuse_connections=True)
+        if self.connection_pool:
+            await self.connection_pool.disconnect(inuse_connections=True)
+            self.connection_pool = None
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {"sessions": self.sessions, "unused_sessions": self.unused_sessions}
 
     @contextlib.asynccontextmanager
-    async def get_async_session(self) -> typing.AsyncGenerator[redis.Redis, None]:  # type: ignore[override]
-        # TODO: FIXME: Fix mypy ignored error.
-        with redis.Redis(connection_pool=self.connection_pool) as session:
-            yield session
+    async def get_async_session(self) -> typing.AsyncGenerator[redis.asyncio.Redis, None]:  # type: ignore[override]
+        """The client is created on its first use, so that requests which don't need Redis don't pay for it."""
+        if not self.connection_pool:
+            raise RuntimeError("Redis is not opened")
+
+        connection_pool = self.connection_pool
+        self.sessions += 1
+        lazy_session = src.util.struct.lazy_proxy.LazyProxy(
+            lambda: redis.asyncio.Redis(connection_pool=connection_pool)
+        )
+        try:
+            yield typing.cast(redis.asyncio.Redis, lazy_session)
+        finally:
+            if lazy_session.is_created:
+                await lazy_session.target.aclose()
+            else:
+                self.unused_sessions += 1
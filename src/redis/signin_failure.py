@@ -0,0 +1,30 @@
+import datetime
+import uuid
+
+import redis.asyncio
+import src.const.redis
+
+# Counter is reset after this long without a failed signin.
+SIGNIN_FAILURE_WINDOW = datetime.timedelta(days=1)
+
+# INCR and EXPIRE must be atomic, or a crash between them leaves a counter which never expires.
+INCREMENT_WITH_TTL_SCRIPT = """
+local count = redis.call("INCR", KEYS[1])
+redis.call("EXPIRE", KEYS[1], ARGV[1])
+return count
+"""
+
+
+def get_signin_failure_key(user_uuid: uuid.UUID) -> str:
+    return src.const.redis.RedisKeyType.SIGNIN_FAILURE_COUNT.as_redis_key(str(user_uuid))
+
+
+async def increment_signin_failure(redis_session: redis.asyncio.Redis, user_uuid: uuid.UUID) -> int:
+    """Returns the number of consecutive signin failures including this one."""
+    script = redis_session.register_script(INCREMENT_WITH_TTL_SCRIPT)
+    key = get_signin_failure_key(user_uuid)
+    return int(await script(keys=[key], args=[int(SIGNIN_FAILURE_WINDOW.total_seconds())]))
+
+
+async def reset_signin_failure(redis_session: redis.asyncio.Redis, user_uuid: uuid.UUID) -> None:
+    await redis_session.delete(get_signin_failure_key(user_uuid))
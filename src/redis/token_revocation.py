@@ -0,0 +1,232 @@
+import asyncio
+import contextlib
+import datetime
+import json
+import logging
+import time
+import typing
+import uuid
+
+import redis.asyncio
+import src.const.jwt
+import src.const.redis
+import src.redis
+import src.util.type_util
+
+logger = logging.getLogger(__name__)
+
+TOKEN_REVOKED_CHANNEL = src.const.redis.RedisKeyType.TOKEN_REVOKED.value
+# Sorted set of revoked jtis scored by their expiration unix timestamp, so that workers can load them at once.
+TOKEN_REVOKED_INDEX_KEY = src.const.redis.RedisKeyType.TOKEN_REVOKED_INDEX.value
+# Sorted set of user uuids scored by their revocation epoch, tokens of the user issued before it are revoked.
+TOKEN_REVOKED_BEFORE_INDEX_KEY = src.const.redis.RedisKeyType.TOKEN_REVOKED_BEFORE_INDEX.value
+# Every token issued before this long ago is already expired, so older epochs don't need to be kept.
+TOKEN_MAX_LIFETIME = src.const.jwt.UserJWTTokenType.refresh.value.expiration_delta
+RECONNECT_MAX_BACKOFF = 30.0  # seconds
+PRUNE_INTERVAL = 60.0  # seconds
+
+
+class TokenRevocationConfigDescriptor(typing.Protocol):
+    class SecurityConfigDescriptor(typing.Protocol):
+        token_revocation_local_cache: bool
+        token_revocation_max_staleness: float
+
+    security: SecurityConfigDescriptor
+
+
+class RevocableToken(typing.Protocol):
+    jti: uuid.UUID
+    user: uuid.UUID
+
+    @property
+    def claimed_at(self) -> datetime.datetime: ...
+
+
+async def revoke_token(redis_session: redis.asyncio.Redis, jti: uuid.UUID, expires_in: datetime.timedelta) -> None:
+    """Marks a single token(session) as revoked on Redis, and notifies it to all API workers."""
+    now = time.time()
+    expires_at = now + expires_in.total_seconds()
+    redis_key = src.const.redis.RedisKeyType.TOKEN_REVOKED.as_redis_key(str(jti))
+    message = json.dumps({"jti": str(jti), "exp": expires_at, "published_at": now})
+
+    async with redis_session.pipeline(transaction=True) as pipeline:
+        pipeline.set(redis_key, "1", ex=expires_in)
+        # Expired jtis are trimmed on every revocation, so the index only holds the ones still revoked.
+        pipeline.zremrangebyscore(TOKEN_REVOKED_INDEX_KEY, "-inf", now)
+        pipeline.zadd(TOKEN_REVOKED_INDEX_KEY, {str(jti): expires_at})
+        pipeline.publish(TOKEN_REVOKED_CHANNEL, message)
+        await pipeline.execute()
+
+
+async def revoke_user_tokens(
+    redis_session: redis.asyncio.Redis, user: uuid.UUID, revoked_before: datetime.datetime
+) -> None:
+    """Revokes all tokens of the user issued before `revoked_before`, and notifies it to all API workers."""
+    now = time.time()
+    epoch = revoked_before.timestamp()
+    redis_key = src.const.redis.RedisKeyType.TOKEN_REVOKED_BEFORE.as_redis_key(str(user))
+    message = json.dumps({"user": str(user), "revoked_before": epoch, "published_at": now})
+
+    async with redis_session.pipeline(transaction=True) as pipeline:
+        pipeline.set(redis_key, epoch, ex=TOKEN_MAX_LIFETIME)
+        # Epochs older than the longest token lifetime revoke nothing anymore, so they are trimmed from the index.
+        pipeline.zremrangebyscore(TOKEN_REVOKED_BEFORE_INDEX_KEY, "-inf", now - TOKEN_MAX_LIFETIME.total_seconds())
+        pipeline.zadd(TOKEN_REVOKED_BEFORE_INDEX_KEY, {str(user): epoch}, gt=True)
+        pipeline.publish(TOKEN_REVOKED_CHANNEL, message)
+        await pipeline.execute()
+
+
+async def is_token_revoked_on_redis(redis_session: redis.asyncio.Redis, token: RevocableToken) -> bool:
+    async with redis_session.pipeline(transaction=False) as pipeline:
+        pipeline.get(src.const.redis.RedisKeyType.TOKEN_REVOKED_BEFORE.as_redis_key(str(token.user)))
+        pipeline.exists(src.const.redis.RedisKeyType.TOKEN_REVOKED.as_redis_key(str(token.jti)))
+        revoked_before, jti_revoked = await pipeline.execute()
+
+    return bool(jti_revoked) or (revoked_before is not None and token.claimed_at.timestamp() < float(revoked_before))
+
+
+class TokenRevocationCache(src.util.type_util.AsyncConnectedResource):
+    """
+    Per-worker copy of the revoked tokens and per-user revocation epochs, kept up to date by Redis pub/sub.
+    The full set is reloaded whenever the subscription is (re)established,
+    and callers must fall back to Redis while the copy might be stale.
+    """
+
+    config_obj: TokenRevocationConfigDescriptor
+    listener: asyncio.Task | None = None
+
+    def __init__(self, config_obj: TokenRevocationConfigDescriptor, async_redis: src.redis.AsyncRedis) -> None:
+        self.config_obj = config_obj
+        self.async_redis = async_redis
+        self.enabled = config_obj.security.token_revocation_local_cache
+        self.max_staleness = config_obj.security.token_revocation_max_staleness
+
+        self.revoked: dict[str, float] = {}  # jti -> expiration unix timestamp
+        self.revoked_before: dict[str, float] = {}  # user uuid -> revocation epoch unix timestamp
+        self.subscribed = False
+        self.last_alive_at = 0.0
+        self.last_pruned_at = 0.0
+
+        self.resyncs = 0
+        self.messages = 0
+        self.stale_fallbacks = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+
+    async def aopen(self) -> typing.Self:
+        if self.enabled:
+            self.listener = asyncio.create_task(self.listen(), name="token-revocation-listener")
+        return self
+
+    async def aclose(self) -> None:
+        if self.listener:
+            self.listener.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.listener
+            self.listener = None
+        self.subscribed = False
+
+    @property
+    def is_stale(self) -> bool:
+        return not self.subscribed or time.monotonic() - self.last_alive_at > self.max_staleness
+
+    def is_revoked(self, token: RevocableToken) -> bool | None:
+        """Returns None when the local copy cannot be trusted, so the caller should ask Redis instead."""
+        if self.is_stale:
+            self.stale_fallbacks += 1
+            return None
+        if self.revoked.get(str(token.jti), 0.0) > time.time():
+            return True
+        return token.claimed_at.timestamp() < self.revoked_before.get(str(token.user), 0.0)
+
+    def add(self, jti: str, expires_at: float) -> None:
+        self.revoked[jti] = max(self.revoked.get(jti, 0.0), expires_at)
+
+    def add_epoch(self, user: str, revoked_before: float) -> None:
+        self.revoked_before[user] = max(self.revoked_before.get(user, 0.0), revoked_before)
+
+    def prune(self) -> None:
+        now = time.time()
+        oldest_epoch = now - TOKEN_MAX_LIFETIME.total_seconds()
+        self.revoked = {jti: expires_at for jti, expires_at in self.revoked.items() if expires_at > now}
+        self.revoked_before = {user: epoch for user, epoch in self.revoked_before.items() if epoch > oldest_epoch}
+        self.last_pruned_at = time.monotonic()
+
+    async def resync(self, session: redis.asyncio.Redis) -> None:
+        now = time.time()
+        oldest_epoch = now - TOKEN_MAX_LIFETIME.total_seconds()
+        async with session.pipeline(transaction=False) as pipeline:
+            pipeline.zrange(TOKEN_REVOKED_INDEX_KEY, now, "+inf", byscore=True, withscores=True)
+            pipeline.zrange(TOKEN_REVOKED_BEFORE_INDEX_KEY, oldest_epoch, "+inf", byscore=True, withscores=True)
+            revoked, epochs = await pipeline.execute()
+
+        # Messages received while resyncing are applied after this, so merge instead of replacing.
+        for jti, expires_at in revoked:
+            self.add(jti.decode(), expires_at)
+        for user, epoch in epochs:
+            self.add_epoch(user.decode(), epoch)
+        self.prune()
+        self.resyncs += 1
+
+    def handle_message(self, data: bytes) -> None:
+        payload: dict[str, typing.Any] = json.loads(data)
+        if "jti" in payload:
+            self.add(payload["jti"], payload["exp"])
+        else:
+            self.add_epoch(payload["user"], payload["revoked_before"])
+
+        lag = max(time.time() - payload["published_at"], 0.0)
+        self.messages += 1
+        self.last_lag = lag
+        self.max_lag = max(self.max_lag, lag)
+        self.total_lag += lag
+
+    async def listen(self) -> None:
+        backoff = 1.0
+        while True:
+            try:
+                async with self.async_redis.get_async_session() as session:
+                    async with session.pubsub(ignore_subscribe_messages=True) as pubsub:
+                        # Subscribe before resyncing, so that revocations made during the resync are not missed.
+                        await pubsub.subscribe(TOKEN_REVOKED_CHANNEL)
+                        await self.resync(session)
+
+                        self.subscribed, backoff = True, 1.0
+                        self.last_alive_at = last_pinged_at = time.monotonic()
+                        while True:
+                            # Ping periodically, as a half-open connection would look just like a quiet channel.
+                            if time.monotonic() - last_pinged_at > self.max_staleness / 3:
+                                await pubsub.ping()
+                                last_pinged_at = time.monotonic()
+
+                            if message := await pubsub.get_message(timeout=1.0):
+                                if message["type"] == "message":
+                                    self.handle_message(message["data"])
+                                self.last_alive_at = time.monotonic()
+
+                            if time.monotonic() - self.last_pruned_at > PRUNE_INTERVAL:
+                                self.prune()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Token revocation listener disconnected, retrying in {backoff}s: {e}")
+                self.subscribed = False
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, RECONNECT_MAX_BACKOFF)
+
+    @property
+    def stats(self) -> dict[str, int | float | bool]:
+        return {
+            "enabled": self.enabled,
+            "subscribed": self.subscribed,
+            "size": len(self.revoked),
+            "epochs": len(self.revoked_before),
+            "resyncs": self.resyncs,
+            "messages": self.messages,
+            "stale_fallbacks": self.stale_fallbacks,
+            "staleness_s": time.monotonic() - self.last_alive_at if self.last_alive_at else -1.0,
+            "lag_last_ms": self.last_lag * 1000,
+            "lag_max_ms": self.max_lag * 1000,
+            "lag_avg_ms": self.total_lag / self.messages * 1000 if self.messages else 0.0,
+        }
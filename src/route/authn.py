@@ -42,13 +42,20 @@ async def set_csrf_token(
 
 
 @router.post(path="/signup/", response_model=user_schema.UserDTO)
-async def signup(db_session: common_dep.dbDI, payload: user_schema.UserCreate) -> user_model.User:
-    return await user_crud.userCRUD.create(db_session, obj_in=payload)
+async def signup(
+    db_session: common_dep.dbDI,
+    password_hasher: common_dep.passwordHasherDI,
+    payload: user_schema.UserCreate,
+) -> user_model.User:
+    return await user_crud.userCRUD.create(db_session, obj_in=payload, password_hasher=password_hasher)
 
 
 @router.post(path="/signin/", response_model=user_schema.UserTokenResponse)
 async def signin(
     db_session: common_dep.dbDI,
+    redis_session: common_dep.redisDI,
+    write_behind: common_dep.writeBehindDI,
+    password_hasher: common_dep.passwordHasherDI,
     config_obj: common_dep.settingDI,
     user_ip: header_dep.user_ip,
     user_agent: header_dep.user_agent,
@@ -56,7 +63,14 @@ async def signin(
     payload: typing.Annotated[fastapi.security.OAuth2PasswordRequestForm, fastapi.Depends()],
     response: fastapi.Response,
 ) -> dict:
-    user = await user_crud.userCRUD.signin(db_session, user_ident=payload.username, password=payload.password)
+    user = await user_crud.userCRUD.signin(
+        db_session,
+        redis_session=redis_session,
+        write_behind=write_behind,
+        password_hasher=password_hasher,
+        user_ident=payload.username,
+        password=payload.password,
+    )
     refresh_token_obj = await src.crud.authn_history.userSignInHistoryCRUD.signin(
         session=db_session,
         obj_in=src.schema.authn_history.UserSignInHistoryCreate(
@@ -91,7 +105,8 @@ async def signout(
     await src.crud.authn_history.userSignInHistoryCRUD.delete(
         session=db_session,
         redis_session=redis_session,
-        token=access_token,
+        user_uuid=access_token.user,
+        uuid=access_token.jti,
     )
 
     response.status_code = 204
@@ -106,12 +121,15 @@ async def verify(access_token: authn_dep.access_token_di) -> dict:
 @router.get(path="/refresh/", response_model=user_schema.UserTokenResponse)
 async def refresh(
     db_session: common_dep.dbDI,
+    write_behind: common_dep.writeBehindDI,
     config_obj: common_dep.settingDI,
     csrf_token: header_dep.csrf_token,
     refresh_token: authn_dep.refresh_token_di,
     response: fastapi.Response,
 ) -> dict:
-    refresh_token = await src.crud.authn_history.userSignInHistoryCRUD.refresh(session=db_session, token=refresh_token)
+    refresh_token = await src.crud.authn_history.userSignInHistoryCRUD.refresh(
+        session=db_session, write_behind=write_behind, token=refresh_token
+    )
 
     src.util.fastapi.cookie.Cookie(
         **src.const.cookie.CookieKey.REFRESH_TOKEN.to_cookie_config(),
@@ -125,11 +143,15 @@ async def refresh(
 @router.post(path="/update-password/", response_model=user_schema.UserDTO)
 async def update_password(
     db_session: common_dep.dbDI,
+    redis_session: common_dep.redisDI,
+    password_hasher: common_dep.passwordHasherDI,
     access_token: authn_dep.access_token_di,
     payload: user_schema.UserPasswordUpdate,
 ) -> user_model.User:
     return await user_crud.userCRUD.update_password(
         session=db_session,
+        redis_session=redis_session,
+        password_hasher=password_hasher,
         uuid=access_token.user,
         obj_in=payload,
     )
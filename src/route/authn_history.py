@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import typing
 import uuid
 
 import fastapi
@@ -15,23 +14,50 @@ import src.crud.authn_history
 import src.db.model.user as user_model
 import src.dependency.authn as authn_dep
 import src.dependency.common as common_dep
+import src.dependency.header as header_dep
 import src.schema.authn_history
+import src.schema.user as user_schema
 import src.util.fastapi
 import src.util.fastapi.cookie
+import src.util.fastapi.pagination
+import src.util.fastapi.streaming
 
 router = fastapi.APIRouter(tags=[src.const.tag.OpenAPITag.AUTHN_SIGNIN_HISTORY], prefix="/authn/history")
 
 
-@router.get(path="/", response_model=list[src.schema.authn_history.UserSignInHistoryDTO])
+@router.get(
+    path="/",
+    response_model=src.util.fastapi.pagination.CursorPage[src.schema.authn_history.UserSignInHistoryDTO],
+    response_class=src.util.fastapi.streaming.JSONStreamingResponse,
+)
 async def get_signin_history(
-    db_session: common_dep.dbDI, access_token: authn_dep.access_token_di
-) -> typing.Iterable[user_model.UserSignInHistory]:
+    async_db: common_dep.asyncDBDI,
+    read_after_write: common_dep.readAfterWriteDI,
+    access_token: authn_dep.access_token_di,
+    accept: header_dep.accept = None,
+    cursor: common_dep.pageCursorQuery = None,
+    limit: common_dep.pageLimitQuery = 20,
+) -> fastapi.responses.StreamingResponse:
+    crud = src.crud.authn_history.userSignInHistoryCRUD
     stmt = sa.select(user_model.UserSignInHistory).where(
         user_model.UserSignInHistory.user_uuid == access_token.user,
-        user_model.UserSignInHistory.expires_at.is_(None),
+        user_model.UserSignInHistory.expires_at > sa.func.now(),
         user_model.UserSignInHistory.deleted_at.is_(None),
     )
-    return await src.crud.authn_history.userSignInHistoryCRUD.get_multi_using_query(db_session, stmt)
+    if src.util.fastapi.streaming.wants_ndjson(accept):
+        rows = crud.stream_using_db(
+            async_db, crud.get_keyset_query(stmt, cursor=cursor), read_after_write=read_after_write
+        )
+        return src.util.fastapi.streaming.NDJSONStreamingResponse(
+            src.util.fastapi.streaming.ndjson_chunks(rows, src.schema.authn_history.UserSignInHistoryDTO)
+        )
+
+    rows = crud.stream_using_db(
+        async_db, crud.get_keyset_query(stmt, cursor=cursor, limit=limit + 1), read_after_write=read_after_write
+    )
+    return src.util.fastapi.streaming.JSONStreamingResponse(
+        src.util.fastapi.streaming.cursor_page_chunks(rows, src.schema.authn_history.UserSignInHistoryDTO, limit)
+    )
 
 
 @router.delete(path="/{usih_uuid}")
@@ -48,6 +74,33 @@ async def revoke_signin_history(
     await src.crud.authn_history.userSignInHistoryCRUD.delete(
         session=db_session,
         redis_session=redis_session,
-        token=access_token,
+        user_uuid=access_token.user,
+        uuid=usih_uuid,
     )
     response.status_code = 204
+
+
+@router.delete(path="/", response_model=user_schema.UserTokenResponse)
+async def revoke_other_signin_histories(
+    db_session: common_dep.dbDI,
+    redis_session: common_dep.redisDI,
+    config_obj: common_dep.settingDI,
+    csrf_token: header_dep.csrf_token,
+    access_token: authn_dep.access_token_di,
+    response: fastapi.Response,
+) -> dict:
+    """현재 기기를 제외한 모든 기기에서 로그아웃합니다. 현재 기기의 인증 정보는 새로 발급됩니다."""
+    refresh_token = await src.crud.authn_history.userSignInHistoryCRUD.revoke_others(
+        session=db_session,
+        redis_session=redis_session,
+        token=access_token,
+        config_obj=config_obj,
+    )
+
+    src.util.fastapi.cookie.Cookie(
+        **src.const.cookie.CookieKey.REFRESH_TOKEN.to_cookie_config(),
+        **config_obj.to_cookie_config(),
+        value=refresh_token.jwt,
+        expires=refresh_token.exp,
+    ).set_cookie(response)
+    return {"access_token": refresh_token.to_access_token(csrf_token=csrf_token).jwt, "token_type": "bearer"}
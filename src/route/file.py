@@ -11,8 +11,12 @@ import src.crud.file as file_crud
 import src.db.model.file as file_model
 import src.dependency.authn as authn_dep
 import src.dependency.common as common_dep
+import src.dependency.header as header_dep
 import src.schema.file as file_schema
 import src.schema.user as user_schema
+import src.util.fastapi.etag
+import src.util.fastapi.pagination
+import src.util.fastapi.streaming
 import src.util.file_util
 
 router = fastapi.APIRouter(tags=[src.const.tag.OpenAPITag.USER_FILE], prefix="/file")
@@ -26,29 +30,57 @@ def check_file_permission(file: file_model.File | None, token_obj: user_schema.A
     return file
 
 
-@router.get(path="/", response_model=list[file_schema.FileInfoDTO])
+@router.get(
+    path="/",
+    response_model=src.util.fastapi.pagination.CursorPage[file_schema.FileInfoDTO],
+    response_class=src.util.fastapi.streaming.JSONStreamingResponse,
+)
 async def list_user_file_infos(
-    db_session: common_dep.dbDI, access_token: authn_dep.access_token_di
-) -> typing.Iterable[file_model.File]:
-    """유저의 파일 목록을 반환합니다."""
-    stmt = sa.select(file_model.File).where(file_model.File.created_by_uuid == access_token.user)
-    return await file_crud.fileCRUD.get_multi_using_query(db_session, stmt)
+    async_db: common_dep.asyncDBDI,
+    read_after_write: common_dep.readAfterWriteDI,
+    access_token: authn_dep.access_token_di,
+    accept: header_dep.accept = None,
+    cursor: common_dep.pageCursorQuery = None,
+    limit: common_dep.pageLimitQuery = 20,
+) -> fastapi.responses.StreamingResponse:
+    """
+    유저의 파일 목록을 최신순으로 반환합니다. 다음 페이지는 응답의 next_cursor를 cursor로 전달해 조회할 수 있습니다.
+    Accept 헤더가 application/x-ndjson이면 cursor 이후의 모든 파일을 한 줄에 하나씩 반환합니다.
+    """
+    stmt = sa.select(file_model.File).where(
+        file_model.File.created_by_uuid == access_token.user, file_model.File.deleted_at.is_(None)
+    )
+    if src.util.fastapi.streaming.wants_ndjson(accept):
+        stmt = file_crud.fileCRUD.get_keyset_query(stmt, cursor=cursor)
+        rows = file_crud.fileCRUD.stream_using_db(async_db, stmt, read_after_write=read_after_write)
+        return src.util.fastapi.streaming.NDJSONStreamingResponse(
+            src.util.fastapi.streaming.ndjson_chunks(rows, file_schema.FileInfoDTO)
+        )
+
+    stmt = file_crud.fileCRUD.get_keyset_query(stmt, cursor=cursor, limit=limit + 1)
+    rows = file_crud.fileCRUD.stream_using_db(async_db, stmt, read_after_write=read_after_write)
+    return src.util.fastapi.streaming.JSONStreamingResponse(
+        src.util.fastapi.streaming.cursor_page_chunks(rows, file_schema.FileInfoDTO, limit)
+    )
 
 
 @router.get(path="/{file_id}/info/", response_model=file_schema.FileInfoDTO)
 async def get_file_info(
     file_id: uuid.UUID,
-    db_session: common_dep.dbDI,
+    db_session: common_dep.dbReadOnlyDI,
     access_token: authn_dep.access_token_or_none_di,
+    response: fastapi.Response,
 ) -> file_model.File:
-    """파일 정보를 반환합니다."""
-    return check_file_permission(await file_crud.fileCRUD.get(db_session, file_id), access_token)
+    """파일 정보를 반환합니다. `ETag`는 파일 정보 수정 시 `If-Match`에 사용할 수 있습니다."""
+    file_record = check_file_permission(await file_crud.fileCRUD.get(db_session, file_id), access_token)
+    src.util.fastapi.etag.set_etag(response, file_record.commit_id)
+    return file_record
 
 
 @router.head(path="/{file_id}/")
 async def get_file_metadata(
     file_id: uuid.UUID,
-    db_session: common_dep.dbDI,
+    db_session: common_dep.dbReadOnlyDI,
     access_token: authn_dep.access_token_or_none_di,
 ) -> fastapi.responses.Response:
     """파일 메타데이터를 반환합니다."""
@@ -60,7 +92,7 @@ async def get_file_metadata(
 @router.get(path="/{file_id}/")
 async def get_file_binary(
     file_id: uuid.UUID,
-    db_session: common_dep.dbDI,
+    db_session: common_dep.dbReadOnlyDI,
     access_token: authn_dep.access_token_or_none_di,
 ) -> fastapi.responses.FileResponse:
     """파일의 미리보기를 제공합니다."""
@@ -76,7 +108,7 @@ async def get_file_binary(
 @router.get(path="/{file_id}/download/")
 async def download_file_binary(
     file_id: uuid.UUID,
-    db_session: common_dep.dbDI,
+    db_session: common_dep.dbReadOnlyDI,
     access_token: authn_dep.access_token_or_none_di,
 ) -> fastapi.responses.FileResponse:
     """파일을 다운로드합니다."""
@@ -1,4 +1,5 @@
 import logging
+import typing
 
 import fastapi
 import sqlalchemy as sa
@@ -19,6 +20,15 @@ class ReadyzResponse(src.util.fastapi.EmptyResponseSchema):
     cache: bool
 
 
+class StatzResponse(src.util.fastapi.EmptyResponseSchema):
+    access_token_cache: dict[str, int | float]
+    database: dict[str, typing.Any]
+    redis: dict[str, int]
+    password_hasher: dict[str, int | float]
+    token_revocation: dict[str, int | float | bool]
+    write_behind: dict[str, int | float | str]
+
+
 class AccessInfoResponse(src.util.fastapi.EmptyResponseSchema):
     user_agent: str
     user_ip: str
@@ -49,13 +59,27 @@ async def readyz(
         logger.exception(src.util.exception_util.get_traceback_msg(e))
 
     try:
-        response["cache"] = redis_session.ping()
+        response["cache"] = await redis_session.ping()
     except Exception as e:
         logger.exception("Redis connection failed")
         logger.exception(src.util.exception_util.get_traceback_msg(e))
     return response
 
 
+@router.get("/statz", response_model=StatzResponse)
+async def statz(request: fastapi.Request) -> dict[str, typing.Any]:
+    fastapi_app: fastapi.FastAPI = request.app
+    return {
+        "message": "ok",
+        "access_token_cache": fastapi_app.state.access_token_cache.stats,
+        "database": fastapi_app.state.async_db.stats,
+        "redis": fastapi_app.state.async_redis.stats,
+        "password_hasher": fastapi_app.state.password_hasher.stats,
+        "token_revocation": fastapi_app.state.token_revocation_cache.stats,
+        "write_behind": fastapi_app.state.write_behind.stats,
+    }
+
+
 @router.get("/access_info", response_model=AccessInfoResponse)
 async def access_info(
     user_ip: header_dep.user_ip = None,
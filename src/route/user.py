@@ -11,14 +11,23 @@ import src.crud.user as user_crud
 import src.db.model.user as user_model
 import src.dependency.authn as authn_dep
 import src.dependency.common as common_dep
+import src.dependency.header as header_dep
 import src.schema.user as user_schema
+import src.util.fastapi.etag
 
 router = fastapi.APIRouter(tags=[src.const.tag.OpenAPITag.USER], prefix="/user")
 
 
 @router.get(path="/info/me/", response_model=user_schema.UserDTO)
-async def get_me(db_session: common_dep.dbDI, access_token: authn_dep.access_token_di) -> user_model.User:
-    return await user_crud.userCRUD.get(db_session, access_token.user)
+async def get_me(
+    db_session: common_dep.dbReadOnlyDI,
+    access_token: authn_dep.access_token_di,
+    response: fastapi.Response,
+) -> user_model.User:
+    if not (user := await user_crud.userCRUD.get(db_session, access_token.user)):
+        src.const.error.ClientError.RESOURCE_NOT_FOUND().raise_()
+    src.util.fastapi.etag.set_etag(response, user.commit_id)
+    return user
 
 
 @router.post(path="/info/me/", response_model=user_schema.UserDTO)
@@ -26,14 +35,22 @@ async def update_me(
     db_session: common_dep.dbDI,
     access_token: authn_dep.access_token_di,
     payload: user_schema.UserUpdate,
+    response: fastapi.Response,
+    if_match: header_dep.if_match,
 ) -> user_model.User:
-    user = await user_crud.userCRUD.get(db_session, access_token.user)
-    return await user_crud.userCRUD.update(db_session, db_obj=user, obj_in=payload)
+    """`If-Match`에 이전에 받은 `ETag`를 넣으면, 그 사이에 다른 곳에서 수정된 경우 412 응답을 반환합니다."""
+    user = await user_crud.userCRUD.update_using_uuid(db_session, access_token.user, payload, commit_ids=if_match)
+    if not user:
+        if if_match is not None:
+            src.const.error.ClientError.RESOURCE_MODIFIED().raise_()
+        src.const.error.ClientError.RESOURCE_NOT_FOUND().raise_()
+    src.util.fastapi.etag.set_etag(response, user.commit_id)
+    return user
 
 
 @router.get(path="/info/{username}/", response_model=user_schema.UserDTO)
 async def get_user(
-    db_session: common_dep.dbDI,
+    db_session: common_dep.dbReadOnlyDI,
     username: str,
     access_token: authn_dep.access_token_or_none_di,
 ) -> user_model.User:
@@ -4,10 +4,8 @@ import datetime
 import typing
 import uuid
 
-import argon2
 import jwt
 import pydantic
-import pydantic_core
 
 import src.config.fastapi
 import src.const.jwt
@@ -67,11 +65,6 @@ class UserCreate(normalizer.NormalizerModelMixin):  # A.k.a. Sign Up
 
         return self
 
-    @pydantic.field_serializer("password", when_used="always")
-    def serialize_password(self, v: str) -> str:
-        """DB에 비밀번호의 해시를 저장하도록 합니다."""
-        return argon2.PasswordHasher().hash(v)
-
 
 class UserUpdate(normalizer.NormalizerModelMixin, with_model.WithSAModelMixin[user_model.User]):
     username: src.util.string_util.UsernameField
@@ -108,16 +101,6 @@ class UserPasswordUpdateForModel(UserPasswordUpdate, with_model.WithSAModelMixin
 
     password: str  # DB record of current password, hashed
 
-    @pydantic.field_validator("original_password", mode="after")
-    @classmethod
-    def validate_original_password(cls, value: str, info: pydantic_core.core_schema.ValidationInfo) -> str:
-        try:
-            argon2.PasswordHasher().verify(info.data["password"], value)
-        except argon2.exceptions.VerifyMismatchError:
-            raise ValueError("기존 비밀번호와 일치하지 않아요!")
-
-        return value
-
     @pydantic.model_validator(mode="after")
     def validate_model(self) -> typing.Self:
         super().validate_model()
@@ -146,13 +129,14 @@ class UserJWTToken(pydantic.BaseModel):
 
     # Public Claim
     user_agent: str  # User-Agent from Token
+    user_agent_fingerprint: src.util.string_util.UserAgentFingerprint | None = None  # Parsed User-Agent from Token
     request_user_agent: str = pydantic.Field(exclude=True)  # User-Agent from Request
 
     # For encryption and decryption
     key: str = pydantic.Field(exclude=True)
     config_obj: src.config.fastapi.FastAPISetting = pydantic.Field(exclude=True)
 
-    JWT_FIELD: typing.ClassVar[set[str]] = {"iss", "exp", "sub", "jti", "user", "user_agent"}
+    JWT_FIELD: typing.ClassVar[set[str]] = {"iss", "exp", "sub", "jti", "user", "user_agent", "user_agent_fingerprint"}
 
     @classmethod
     def from_token(
@@ -167,7 +151,7 @@ class UserJWTToken(pydantic.BaseModel):
 
     @property
     def jwt(self) -> str:
-        payload = {k: v for k, v in dict(self).items() if k in self.JWT_FIELD}
+        payload = {k: v for k, v in dict(self).items() if k in self.JWT_FIELD and v is not None}
         payload = src.util.json_util.dict_to_jsonable_dict(payload | {"exp": self.exp.timestamp()})
         return jwt.encode(payload=payload, key=self.key)
 
@@ -178,7 +162,10 @@ class UserJWTToken(pydantic.BaseModel):
 
     @pydantic.model_validator(mode="after")
     def validate_model(self) -> typing.Self:
-        if not src.util.string_util.compare_user_agent(self.request_user_agent, self.user_agent):
+        token_fingerprint = self.user_agent_fingerprint or src.util.string_util.get_user_agent_fingerprint(
+            self.user_agent
+        )
+        if src.util.string_util.get_user_agent_fingerprint(self.request_user_agent) != token_fingerprint:
             raise jwt.exceptions.InvalidTokenError("User-Agent does not compatable")
 
         return self
@@ -218,6 +205,11 @@ class RefreshToken(UserJWTToken):
             jti=signin_history.uuid,
             user=signin_history.user_uuid,
             user_agent=signin_history.user_agent,
+            user_agent_fingerprint=(
+                src.util.string_util.get_user_agent_fingerprint(signin_history.user_agent)
+                if config_obj.security.user_agent_fingerprint_claim
+                else None
+            ),
             request_user_agent=signin_history.user_agent,
             key=config_obj.secret_key.get_secret_value(),
             config_obj=config_obj,
@@ -8,6 +8,7 @@ import billiard.einfo
 import celery
 import celery.app.task
 import celery.result
+import celery.signals
 
 import src.config.celery
 import src.db
@@ -21,43 +22,80 @@ T = typing.TypeVar("T")
 EInfoType = typing.TypeVar("EInfoType", bound=billiard.einfo.ExceptionInfo)
 
 
-class SessionTask(celery.Task, typing.Generic[T]):
-    config_obj: src.config.celery.CelerySetting
-    sync_db: src.db.SyncDB
-    sync_redis: src.redis.SyncRedis
+class WorkerResources:
+    """
+    DB engine and Redis connection pool of a worker process, which every task run in the process borrows sessions from.
+    Opened after the pool process is forked, as connections must not be shared between processes,
+    and closed when the process shuts down, so connections are not set up again for each task.
+    """
 
-    track_started = True
-    default_retry_delay = 60  # Retry after 1 minute.
+    def __init__(self) -> None:
+        self.config_obj: src.config.celery.CelerySetting | None = None
+        self.sync_db: src.db.SyncDB | None = None
+        self.sync_redis: src.redis.SyncRedis | None = None
+
+    @property
+    def is_opened(self) -> bool:
+        return self.sync_db is not None and self.sync_redis is not None
 
-    def __init__(self, *args: tuple, **kwargs: dict) -> None:
-        super().__init__(*args, **kwargs)
+    def open(self) -> None:
+        if self.is_opened:
+            return
         self.config_obj = src.config.celery.get_celery_setting()
-        self.sync_db = src.db.SyncDB(config_obj=self.config_obj)
-        with self.sync_db:
-            # With opening DB connection, we can check if DB is connected.
-            pass
+        # Opening checks whether DB and Redis are connected.
+        self.sync_db = src.db.SyncDB(config_obj=self.config_obj).open()
+        self.sync_redis = src.redis.SyncRedis(config_obj=self.config_obj).open()
+
+    def close(self) -> None:
+        if self.sync_db:
+            with contextlib.suppress(Exception):
+                self.sync_db.close()
+            self.sync_db = None
+        if self.sync_redis:
+            with contextlib.suppress(Exception):
+                self.sync_redis.close()
+            self.sync_redis = None
+
+
+worker_resources = WorkerResources()
+
+
+@celery.signals.worker_process_init.connect
+def open_worker_resources(**kwargs: typing.Any) -> None:
+    # Sent in each child process of the prefork pool. Other pools open them on the first task, see before_start.
+    worker_resources.open()
 
-        self.sync_redis = src.redis.SyncRedis(config_obj=self.config_obj)
-        with self.sync_redis:
-            # Like DB, we can check if Redis is connected with opening the connection.
-            pass
 
-    def __del__(self) -> None:
-        self.close_connections()
+@celery.signals.worker_process_shutdown.connect
+@celery.signals.worker_shutdown.connect
+def close_worker_resources(**kwargs: typing.Any) -> None:
+    worker_resources.close()
 
-    def open_connections(self) -> None:
-        self.sync_db.open()
-        self.sync_redis.open()
 
-    def close_connections(self) -> None:
-        with contextlib.suppress(Exception):
-            self.sync_db.close()
-        with contextlib.suppress(Exception):
-            self.sync_redis.close()
+class SessionTask(celery.Task, typing.Generic[T]):
+    track_started = True
+    default_retry_delay = 60  # Retry after 1 minute.
+
+    @property
+    def config_obj(self) -> src.config.celery.CelerySetting:
+        return src.config.celery.get_celery_setting()
+
+    @property
+    def sync_db(self) -> src.db.SyncDB:
+        if not worker_resources.sync_db:
+            raise RuntimeError("DB is not opened")
+        return worker_resources.sync_db
+
+    @property
+    def sync_redis(self) -> src.redis.SyncRedis:
+        if not worker_resources.sync_redis:
+            raise RuntimeError("Redis is not opened")
+        return worker_resources.sync_redis
 
     @property
     def db_opened(self) -> bool:
-        return all([self.sync_db.engine, self.sync_db.session_maker])
+        sync_db = worker_resources.sync_db
+        return bool(sync_db and sync_db.engine and sync_db.session_maker)
 
     @property
     def task_id(self) -> str | None:
@@ -76,7 +114,7 @@ class SessionTask(celery.Task, typing.Generic[T]):
         Notes that this method will be called every time the task is executed, even if the task is retried.
         """
         logger.warning(f"Task[{task_id}] before_start called")
-        self.open_connections()
+        worker_resources.open()
         return super().before_start(self.task_id, args, kwargs)
 
     def on_retry(self, exc: Exception, task_id: str, args: tuple, kwargs: dict, einfo: EInfoType) -> None:
@@ -107,5 +145,4 @@ class SessionTask(celery.Task, typing.Generic[T]):
         This method is called after the task has returned, after on_success or on_failure has been called.
         """
         logger.warning(f"Task[{task_id}] after_return called: {status} (retval: {retval}, einfo: {einfo})")
-        self.close_connections()
         return super().after_return(status, retval, self.task_id, args, kwargs, einfo)
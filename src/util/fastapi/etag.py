@@ -0,0 +1,17 @@
+import fastapi
+
+import src.const.header
+
+
+def parse_if_match(if_match: str | None) -> list[str] | None:
+    """
+    Returns the entity tags of `If-Match`, which are commit_ids of the resource, or None if any version is fine.
+    Weak tags are dropped, as If-Match only matches strongly.
+    """
+    if not if_match or if_match.strip() == "*":
+        return None
+    return [tag.strip().strip('"') for tag in if_match.split(",") if not tag.strip().startswith("W/")]
+
+
+def set_etag(response: fastapi.Response, commit_id: str) -> None:
+    response.headers[src.const.header.HeaderKey.ETAG.value.alias] = f'"{commit_id}"'
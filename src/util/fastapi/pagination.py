@@ -0,0 +1,43 @@
+import base64
+import binascii
+import datetime
+import typing
+import uuid
+
+import pydantic
+
+import src.const.error
+
+T = typing.TypeVar("T")
+
+
+class Cursor(typing.NamedTuple):
+    """Position of the last item on the previous page, ordered by (created_at, uuid) descending."""
+
+    created_at: datetime.datetime
+    uuid: uuid.UUID
+
+    def encode(self) -> str:
+        raw = f"{self.created_at.isoformat()}|{self.uuid}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, cursor: str) -> "Cursor":
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+            created_at, uuid_str = raw.split("|", maxsplit=1)
+            return cls(created_at=datetime.datetime.fromisoformat(created_at), uuid=uuid.UUID(uuid_str))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            src.const.error.ClientError.INVALID_PAGINATION_CURSOR(input=cursor).raise_()
+
+
+class KeysetPage(typing.NamedTuple, typing.Generic[T]):
+    items: list[T]
+    next_cursor: str | None = None
+
+
+class CursorPage(pydantic.BaseModel, typing.Generic[T]):
+    """Response envelope of cursor paginated lists, pass `next_cursor` as `cursor` to get the next page."""
+
+    items: list[T]
+    next_cursor: str | None = None
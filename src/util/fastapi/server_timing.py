@@ -0,0 +1,37 @@
+import starlette.datastructures
+import starlette.types
+
+import src.const.header
+import src.db.instrumentation
+
+
+class QueryStatsMiddleware:
+    """
+    Collects the statements issued while handling each request, see src.db.instrumentation.QueryInstrumentation,
+    and reports them in the `Server-Timing` header, e.g. `db;dur=12.34;desc="5 queries"`.
+    Statements of a streaming body are sent after the headers, so they are not included.
+    """
+
+    def __init__(self, app: starlette.types.ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(
+        self, scope: starlette.types.Scope, receive: starlette.types.Receive, send: starlette.types.Send
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_stats = src.db.instrumentation.RequestQueryStats()
+
+        async def send_with_server_timing(message: starlette.types.Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = starlette.datastructures.MutableHeaders(scope=message)
+                headers.append(src.const.header.HeaderKey.SERVER_TIMING.value.alias, request_stats.server_timing)
+            await send(message)
+
+        token = src.db.instrumentation.request_query_stats.set(request_stats)
+        try:
+            await self.app(scope, receive, send_with_server_timing)
+        finally:
+            src.db.instrumentation.request_query_stats.reset(token)
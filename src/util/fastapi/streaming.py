@@ -0,0 +1,59 @@
+import json
+import typing
+
+import fastapi.responses
+import pydantic
+
+import src.util.fastapi.pagination
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+class JSONStreamingResponse(fastapi.responses.StreamingResponse):
+    media_type = "application/json"
+
+
+class NDJSONStreamingResponse(fastapi.responses.StreamingResponse):
+    media_type = NDJSON_MEDIA_TYPE
+
+
+def wants_ndjson(accept: str | None) -> bool:
+    return bool(accept) and NDJSON_MEDIA_TYPE in accept
+
+
+async def ndjson_chunks(
+    rows: typing.AsyncIterable[typing.Any], schema: type[pydantic.BaseModel]
+) -> typing.AsyncGenerator[bytes, None]:
+    async for row in rows:
+        yield schema.model_validate(row).model_dump_json().encode() + b"\n"
+
+
+async def json_array_chunks(
+    rows: typing.AsyncIterable[typing.Any], schema: type[pydantic.BaseModel]
+) -> typing.AsyncGenerator[bytes, None]:
+    separator = b"["
+    async for row in rows:
+        yield separator + schema.model_validate(row).model_dump_json().encode()
+        separator = b","
+    yield b"[]" if separator == b"[" else b"]"
+
+
+async def cursor_page_chunks(
+    rows: typing.AsyncIterable[typing.Any], schema: type[pydantic.BaseModel], limit: int
+) -> typing.AsyncGenerator[bytes, None]:
+    """
+    Writes a CursorPage one item at a time.
+    `rows` must be fetched with one more row than `limit`, which only decides whether `next_cursor` exists.
+    """
+    yield b'{"items":'
+
+    count, last, next_cursor = 0, None, None
+    separator = b"["
+    async for row in rows:
+        if count == limit:
+            next_cursor = src.util.fastapi.pagination.Cursor(created_at=last.created_at, uuid=last.uuid).encode()
+            continue
+        yield separator + schema.model_validate(row).model_dump_json().encode()
+        count, last, separator = count + 1, row, b","
+
+    yield (b"[]" if separator == b"[" else b"]") + b',"next_cursor":' + json.dumps(next_cursor).encode() + b"}"
@@ -19,6 +19,7 @@ USERNAME_MAX_LEN = 48
 PW_MIN_LEN = 8
 PW_MAX_LEN = 1024
 PW_MIN_CHAR_TYPE_NUM = 2
+USER_AGENT_FINGERPRINT_CACHE_SIZE = 4096
 
 # ---------- Check and Normalize strings ----------
 char_printable: str = string.ascii_letters + string.digits + string.punctuation
@@ -217,21 +218,33 @@ PasswordField = typing.Annotated[
 ]
 
 
-def compare_user_agent(user_agent_a_str: str, user_agent_b_str: str) -> bool:
-    user_agent_a = user_agents.parse(user_agent_a_str)
-    user_agent_b = user_agents.parse(user_agent_b_str)
-
-    return all(
-        (
-            user_agent_a.is_mobile == user_agent_b.is_mobile,
-            user_agent_a.is_tablet == user_agent_b.is_tablet,
-            user_agent_a.is_pc == user_agent_b.is_pc,
-            user_agent_a.os.family == user_agent_b.os.family,
-            user_agent_a.browser.family == user_agent_b.browser.family,
-        )
+class UserAgentFingerprint(typing.NamedTuple):
+    """Parts of User-Agent that must not be changed while using a same token."""
+
+    is_mobile: bool
+    is_tablet: bool
+    is_pc: bool
+    os_family: str
+    browser_family: str
+
+
+@functools.lru_cache(maxsize=USER_AGENT_FINGERPRINT_CACHE_SIZE)
+def get_user_agent_fingerprint(user_agent_str: str) -> UserAgentFingerprint:
+    # user_agents.parse runs lots of regex, so we cache the parsed result by the raw User-Agent string.
+    user_agent = user_agents.parse(user_agent_str)
+    return UserAgentFingerprint(
+        is_mobile=user_agent.is_mobile,
+        is_tablet=user_agent.is_tablet,
+        is_pc=user_agent.is_pc,
+        os_family=user_agent.os.family,
+        browser_family=user_agent.browser.family,
     )
 
 
+def compare_user_agent(user_agent_a_str: str, user_agent_b_str: str) -> bool:
+    return get_user_agent_fingerprint(user_agent_a_str) == get_user_agent_fingerprint(user_agent_b_str)
+
+
 T = typing.TypeVar("T", bound=enum.Enum)
 
 
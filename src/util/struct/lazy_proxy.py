@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import typing
+
+T = typing.TypeVar("T")
+
+
+class LazyProxy(typing.Generic[T]):
+    """
+    Stands in for an object which is created by `factory` on the first attribute access.
+    Only attribute access is forwarded, so this cannot pass `isinstance` checks of the wrapped type.
+    """
+
+    def __init__(self, factory: typing.Callable[[], T]) -> None:
+        self._lazy_factory = factory
+        self._lazy_target: T | None = None
+
+    @property
+    def is_created(self) -> bool:
+        return self._lazy_target is not None
+
+    @property
+    def target(self) -> T:
+        if self._lazy_target is None:
+            self._lazy_target = self._lazy_factory()
+        return self._lazy_target
+
+    def __getattr__(self, name: str) -> typing.Any:
+        # Only called when normal lookup fails, so attributes of the proxy itself are never forwarded.
+        return getattr(self.target, name)